@@ -1,16 +1,18 @@
 """Centralized configuration management using pydantic-settings."""
 
 import os
-from functools import lru_cache
-from typing import Optional
+import threading
+from typing import Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class UpstageConfig(BaseModel):
     """Upstage Document Parse API configuration."""
 
+    model_config = ConfigDict(frozen=True)
+
     api_key: Optional[str] = Field(default=None, description="Upstage API key")
     endpoint: str = Field(
         default="https://api.upstage.ai/v1/document-digitization",
@@ -24,11 +26,19 @@ class UpstageConfig(BaseModel):
         default="ocr-nightly",
         description="Model for OCR-only mode",
     )
+    max_workers: int = Field(
+        default=8,
+        ge=1,
+        le=64,
+        description="Maximum concurrent document uploads",
+    )
 
 
 class AzureConfig(BaseModel):
     """Azure Document Intelligence configuration."""
 
+    model_config = ConfigDict(frozen=True)
+
     endpoint: Optional[str] = Field(default=None, description="Azure endpoint URL")
     api_key: Optional[str] = Field(default=None, description="Azure API key")
     layout_model: str = Field(
@@ -39,11 +49,28 @@ class AzureConfig(BaseModel):
         default="prebuilt-read",
         description="Model for OCR-only mode",
     )
+    max_workers: int = Field(
+        default=16,
+        ge=1,
+        le=64,
+        description="Maximum concurrent document submissions",
+    )
+    blob_container_url: Optional[str] = Field(
+        default=None,
+        description="SAS URL of a Blob container for staging large inputs (submitted by URL)",
+    )
+    blob_threshold_mb: int = Field(
+        default=10,
+        ge=0,
+        description="Files larger than this (MB) are staged in blob storage when configured",
+    )
 
 
 class GeminiConfig(BaseModel):
     """Google Gemini API configuration."""
 
+    model_config = ConfigDict(frozen=True)
+
     api_key: Optional[str] = Field(default=None, description="Gemini API key")
     model: str = Field(
         default="gemini-2.5-flash",
@@ -55,11 +82,41 @@ class GeminiConfig(BaseModel):
         le=600,
         description="DPI for PDF to image conversion",
     )
+    max_long_side: int = Field(
+        default=1600,
+        ge=0,
+        le=10000,
+        description="Maximum rendered page long side in pixels (0 = no cap)",
+    )
+    jpeg_quality: int = Field(
+        default=80,
+        ge=1,
+        le=100,
+        description="JPEG quality for rendered pages",
+    )
+    max_workers: int = Field(
+        default=8,
+        ge=1,
+        le=64,
+        description="Maximum concurrent page requests",
+    )
+    max_retries: int = Field(
+        default=5,
+        ge=1,
+        le=20,
+        description="Attempts per request on rate-limit (429) or server (5xx) errors",
+    )
+    stream: bool = Field(
+        default=True,
+        description="Stream responses (generate_content_stream) and join the chunks",
+    )
 
 
 class ClaudeConfig(BaseModel):
     """Anthropic Claude API configuration."""
 
+    model_config = ConfigDict(frozen=True)
+
     api_key: Optional[str] = Field(default=None, description="Anthropic API key")
     model: str = Field(
         default="claude-sonnet-4-5-20250929",
@@ -77,11 +134,29 @@ class ClaudeConfig(BaseModel):
         le=600,
         description="DPI for PDF to image conversion",
     )
+    max_long_side: int = Field(
+        default=2048,
+        ge=0,
+        le=10000,
+        description="Maximum rendered page long side in pixels (0 = no cap)",
+    )
+    max_workers: int = Field(
+        default=8,
+        ge=1,
+        le=64,
+        description="Maximum concurrent page requests",
+    )
+    use_files_api: bool = Field(
+        default=False,
+        description="Upload page images via the Files API instead of inline base64",
+    )
 
 
 class QwenConfig(BaseModel):
     """Qwen Vision-Language Model configuration."""
 
+    model_config = ConfigDict(frozen=True)
+
     model: str = Field(
         default="Qwen/Qwen2.5-VL-7B-Instruct",
         description="Qwen model name (HuggingFace path)",
@@ -102,17 +177,178 @@ class QwenConfig(BaseModel):
         default=False,
         description="Whether to use sampling",
     )
+    dpi: int = Field(
+        default=150,
+        ge=72,
+        le=600,
+        description="DPI for PDF to image conversion",
+    )
+    max_long_side: int = Field(
+        default=1600,
+        ge=0,
+        le=10000,
+        description="Maximum rendered page long side in pixels (0 = no cap)",
+    )
+    max_pixels: int = Field(
+        default=0,
+        ge=0,
+        le=100_000_000,
+        description="Maximum rendered page area in pixels (0 = no cap; 802816 = 1024 visual tokens)",
+    )
+    cap_to_native_resolution: bool = Field(
+        default=False,
+        description="Do not render scanned pages above their embedded image resolution",
+    )
+    batch_size: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Pages per generate() call (bounds VRAM use)",
+    )
+    quantization: Literal["none", "int8", "awq"] = Field(
+        default="none",
+        description="Language-model quantization (CUDA only)",
+    )
+    backend: Literal["transformers", "vllm"] = Field(
+        default="transformers",
+        description="Inference backend (vllm: paged KV cache and continuous batching)",
+    )
+    compile: bool = Field(
+        default=False,
+        description="Apply torch.compile to the model (CUDA only; slower first run)",
+    )
+    adaptive_max_new_tokens: bool = Field(
+        default=False,
+        description="Cap max_new_tokens per PDF page from its text layer length",
+    )
+    stop_on_repetition: bool = Field(
+        default=False,
+        description="Stop generation early when the output falls into a repetition loop",
+    )
+    page_cache_size: int = Field(
+        default=0,
+        ge=0,
+        le=100000,
+        description="Pages kept in the in-process page output cache (0 = disabled)",
+    )
+    text_layer_min_chars: int = Field(
+        default=0,
+        ge=0,
+        description="Use a PDF page's text layer instead of the model from this many characters (0 = disabled)",
+    )
 
 
 class YomitokuConfig(BaseModel):
     """YOMITOKU OCR configuration."""
 
+    model_config = ConfigDict(frozen=True)
+
     visualize: bool = Field(
         default=True,
         description="Whether to generate visualization images",
     )
 
 
+class RenderConfig(BaseModel):
+    """Page rasterization and image encoding configuration."""
+
+    model_config = ConfigDict(frozen=True)
+
+    use_turbojpeg: bool = Field(
+        default=True,
+        description="Encode JPEG with libjpeg-turbo (PyTurboJPEG) when installed",
+    )
+    workers: int = Field(
+        default=0,
+        ge=0,
+        le=64,
+        description="Processes for parallel page rendering (0 = min(8, CPU count), 1 = in-process)",
+    )
+    dedup_pages: bool = Field(
+        default=False,
+        description="Reuse the output of visually identical pages (dHash) instead of re-running the model",
+    )
+
+
+class CacheConfig(BaseModel):
+    """Disk-backed OCR result cache configuration."""
+
+    model_config = ConfigDict(frozen=True)
+
+    enabled: bool = Field(
+        default=False,
+        description="Reuse results for identical input, model and prompt (skews timings)",
+    )
+    dir: str = Field(
+        default="~/.cache/ocr",
+        description="Directory holding cached results",
+    )
+
+
+# Legacy/flat environment variables mapped onto the nested settings structure
+# as (env_var, section, field)
+_ENV_MAPPING = (
+    # Upstage
+    ("UPSTAGE_API_KEY", "upstage", "api_key"),
+    ("UPSTAGE_ENDPOINT", "upstage", "endpoint"),
+    ("UPSTAGE_LAYOUT_MODEL", "upstage", "layout_model"),
+    ("UPSTAGE_OCR_MODEL", "upstage", "ocr_model"),
+    ("UPSTAGE_MAX_WORKERS", "upstage", "max_workers"),
+    # Azure
+    ("AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT", "azure", "endpoint"),
+    ("AZURE_DOCUMENT_INTELLIGENCE_API_KEY", "azure", "api_key"),
+    ("AZURE_LAYOUT_MODEL", "azure", "layout_model"),
+    ("AZURE_OCR_MODEL", "azure", "ocr_model"),
+    ("AZURE_MAX_WORKERS", "azure", "max_workers"),
+    ("AZURE_BLOB_CONTAINER_URL", "azure", "blob_container_url"),
+    ("AZURE_BLOB_THRESHOLD_MB", "azure", "blob_threshold_mb"),
+    # Gemini
+    ("GEMINI_API_KEY", "gemini", "api_key"),
+    ("GEMINI_MODEL", "gemini", "model"),
+    ("GEMINI_DPI", "gemini", "dpi"),
+    ("GEMINI_MAX_LONG_SIDE", "gemini", "max_long_side"),
+    ("GEMINI_JPEG_QUALITY", "gemini", "jpeg_quality"),
+    ("GEMINI_CONCURRENCY", "gemini", "max_workers"),  # alias; GEMINI_MAX_WORKERS wins
+    ("GEMINI_MAX_WORKERS", "gemini", "max_workers"),
+    ("GEMINI_MAX_RETRIES", "gemini", "max_retries"),
+    ("GEMINI_STREAM", "gemini", "stream"),
+    # Claude
+    ("ANTHROPIC_API_KEY", "claude", "api_key"),
+    ("CLAUDE_MODEL", "claude", "model"),
+    ("CLAUDE_MAX_TOKENS", "claude", "max_tokens"),
+    ("CLAUDE_DPI", "claude", "dpi"),
+    ("CLAUDE_MAX_LONG_SIDE", "claude", "max_long_side"),
+    ("CLAUDE_MAX_WORKERS", "claude", "max_workers"),
+    ("CLAUDE_USE_FILES_API", "claude", "use_files_api"),
+    # Qwen
+    ("QWEN_MODEL", "qwen", "model"),
+    ("QWEN_MAX_NEW_TOKENS", "qwen", "max_new_tokens"),
+    ("QWEN_TEMPERATURE", "qwen", "temperature"),
+    ("QWEN_DO_SAMPLE", "qwen", "do_sample"),
+    ("QWEN_DPI", "qwen", "dpi"),
+    ("QWEN_MAX_LONG_SIDE", "qwen", "max_long_side"),
+    ("QWEN_MAX_PIXELS", "qwen", "max_pixels"),
+    ("QWEN_CAP_TO_NATIVE_RESOLUTION", "qwen", "cap_to_native_resolution"),
+    ("QWEN_BATCH_SIZE", "qwen", "batch_size"),
+    ("QWEN_QUANTIZATION", "qwen", "quantization"),
+    ("QWEN_BACKEND", "qwen", "backend"),
+    ("QWEN_COMPILE", "qwen", "compile"),
+    ("QWEN_ADAPTIVE_MAX_NEW_TOKENS", "qwen", "adaptive_max_new_tokens"),
+    ("QWEN_STOP_ON_REPETITION", "qwen", "stop_on_repetition"),
+    ("QWEN_PAGE_CACHE_SIZE", "qwen", "page_cache_size"),
+    ("QWEN_TEXT_LAYER_MIN_CHARS", "qwen", "text_layer_min_chars"),
+    # Yomitoku
+    ("YOMITOKU_VISUALIZE", "yomitoku", "visualize"),
+    # Rendering
+    ("RENDER_USE_TURBOJPEG", "render", "use_turbojpeg"),
+    ("RENDER_WORKERS", "render", "workers"),
+    ("RENDER_DEDUP_PAGES", "render", "dedup_pages"),
+    # OCR result cache
+    ("OCR_CACHE_ENABLED", "cache", "enabled"),
+    ("OCR_CACHE_DIR", "cache", "dir"),
+)
+
+
 class Settings(BaseSettings):
     """
     Application settings loaded from environment variables and .env file.
@@ -130,6 +366,8 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         extra="ignore",
         case_sensitive=False,
+        validate_default=False,
+        revalidate_instances="never",
     )
 
     upstage: UpstageConfig = Field(default_factory=UpstageConfig)
@@ -138,55 +376,36 @@ class Settings(BaseSettings):
     claude: ClaudeConfig = Field(default_factory=ClaudeConfig)
     qwen: QwenConfig = Field(default_factory=QwenConfig)
     yomitoku: YomitokuConfig = Field(default_factory=YomitokuConfig)
+    render: RenderConfig = Field(default_factory=RenderConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
 
     def __init__(self, **kwargs):
         """Initialize settings with backwards-compatible env var mapping."""
-        # Map legacy/flat environment variables to nested structure
-        env_mapping = {
-            # Upstage
-            "UPSTAGE_API_KEY": ("upstage", "api_key"),
-            "UPSTAGE_ENDPOINT": ("upstage", "endpoint"),
-            "UPSTAGE_LAYOUT_MODEL": ("upstage", "layout_model"),
-            "UPSTAGE_OCR_MODEL": ("upstage", "ocr_model"),
-            # Azure
-            "AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT": ("azure", "endpoint"),
-            "AZURE_DOCUMENT_INTELLIGENCE_API_KEY": ("azure", "api_key"),
-            "AZURE_LAYOUT_MODEL": ("azure", "layout_model"),
-            "AZURE_OCR_MODEL": ("azure", "ocr_model"),
-            # Gemini
-            "GEMINI_API_KEY": ("gemini", "api_key"),
-            "GEMINI_MODEL": ("gemini", "model"),
-            "GEMINI_DPI": ("gemini", "dpi"),
-            # Claude
-            "ANTHROPIC_API_KEY": ("claude", "api_key"),
-            "CLAUDE_MODEL": ("claude", "model"),
-            "CLAUDE_MAX_TOKENS": ("claude", "max_tokens"),
-            "CLAUDE_DPI": ("claude", "dpi"),
-            # Qwen
-            "QWEN_MODEL": ("qwen", "model"),
-            "QWEN_MAX_NEW_TOKENS": ("qwen", "max_new_tokens"),
-            "QWEN_TEMPERATURE": ("qwen", "temperature"),
-            "QWEN_DO_SAMPLE": ("qwen", "do_sample"),
-            # Yomitoku
-            "YOMITOKU_VISUALIZE": ("yomitoku", "visualize"),
-        }
-
-        # Build nested structure from flat env vars
-        for env_var, (model, field) in env_mapping.items():
-            value = os.getenv(env_var)
+        # Build nested structure from flat env vars in a single pass
+        env = os.environ
+        for env_var, section, field in _ENV_MAPPING:
+            value = env.get(env_var)
             if value is not None:
-                if model not in kwargs:
-                    kwargs[model] = {}
-                if isinstance(kwargs.get(model), dict):
-                    kwargs[model][field] = value
+                section_kwargs = kwargs.setdefault(section, {})
+                if isinstance(section_kwargs, dict):
+                    section_kwargs[field] = value
 
         super().__init__(**kwargs)
 
 
-@lru_cache()
+_SETTINGS: Optional[Settings] = None
+_SETTINGS_LOCK = threading.Lock()
+
+
 def get_settings() -> Settings:
     """
-    Get cached settings instance (singleton pattern).
+    Get the shared settings instance (singleton pattern).
+
+    The instance is built on first use rather than at import, so importing
+    this module does not read the environment and callers always see the
+    current instance after clear_settings_cache(). It is built exactly once
+    (guarded by a lock so concurrent first calls cannot construct it twice)
+    and reused until clear_settings_cache().
 
     Returns:
         Settings: Application settings loaded from environment.
@@ -195,7 +414,14 @@ def get_settings() -> Settings:
         settings = get_settings()
         print(settings.upstage.api_key)
     """
-    return Settings()
+    global _SETTINGS
+    settings = _SETTINGS
+    if settings is None:
+        with _SETTINGS_LOCK:
+            if _SETTINGS is None:
+                _SETTINGS = Settings()
+            settings = _SETTINGS
+    return settings
 
 
 def clear_settings_cache() -> None:
@@ -206,4 +432,6 @@ def clear_settings_cache() -> None:
         clear_settings_cache()
         settings = get_settings()  # Reloads from environment
     """
-    get_settings.cache_clear()
+    global _SETTINGS
+    with _SETTINGS_LOCK:
+        _SETTINGS = None
@@ -1 +1,17 @@
-"""Document processing model implementations."""
\ No newline at end of file
+"""Document processing model implementations."""
+
+import importlib
+
+# Provider subpackages, imported on first attribute access (PEP 562) so that
+# using one backend does not import every other backend's SDK.
+_PROVIDERS = frozenset({"azure", "claude", "gemini", "qwen", "upstage", "yomitoku"})
+
+
+def __getattr__(name):
+    if name in _PROVIDERS:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _PROVIDERS)
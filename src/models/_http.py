@@ -0,0 +1,46 @@
+"""Process-wide HTTP client shared by the API-based model wrappers."""
+
+import importlib.util
+from functools import lru_cache
+
+import httpx
+
+
+@lru_cache(maxsize=1)
+def get_shared_httpx_client():
+    """
+    Get the ``httpx.Client`` shared by the Anthropic and Gemini SDK clients.
+
+    One connection pool serves every wrapper, so a mixed run (e.g. Claude
+    layout then Gemini OCR) reuses warm TCP/TLS connections instead of each SDK
+    opening its own. HTTP/2 is enabled when the optional ``h2`` package is
+    installed, letting concurrent page requests multiplex over one connection.
+
+    Returns:
+        httpx.Client: Shared client (thread-safe)
+    """
+    return httpx.Client(**_client_options())
+
+
+@lru_cache(maxsize=1)
+def get_shared_async_httpx_client():
+    """
+    Get the ``httpx.AsyncClient`` counterpart of ``get_shared_httpx_client``.
+
+    Async connections are bound to the event loop that opened them, so the
+    client must only be used from one long-lived loop (see the Claude
+    wrapper's ``call_pages``).
+
+    Returns:
+        httpx.AsyncClient: Shared async client
+    """
+    return httpx.AsyncClient(**_client_options())
+
+
+def _client_options():
+    """Connection settings shared by the sync and async clients."""
+    return {
+        "http2": importlib.util.find_spec("h2") is not None,
+        "timeout": httpx.Timeout(600.0, connect=5.0),
+        "limits": httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    }
@@ -0,0 +1,150 @@
+"""Shared Azure Document Intelligence client and analysis helpers."""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from azure.ai.documentintelligence import DocumentIntelligenceClient
+from azure.ai.documentintelligence.models import (
+    AnalyzeDocumentRequest,
+    AnalyzeResult,
+    DocumentContentFormat,
+)
+from azure.core.credentials import AzureKeyCredential
+
+from src.config import get_settings
+from src.utils.file_utils import save_markdown
+
+
+def get_azure_client():
+    """Get Azure Document Intelligence client (reused across calls)."""
+    settings = get_settings()
+    return _get_azure_client(settings.azure.endpoint, settings.azure.api_key)
+
+
+@lru_cache(maxsize=1)
+def _get_azure_client(endpoint, api_key):
+    """
+    Create the Azure Document Intelligence client once per process.
+
+    Reusing the client keeps its connection pool (and TLS sessions) warm across
+    documents. Tests that swap credentials must call ``_get_azure_client.cache_clear()``.
+    """
+    return DocumentIntelligenceClient(
+        endpoint=endpoint,
+        credential=AzureKeyCredential(api_key)
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_container_client(container_url):
+    """Create the Blob container client used for staging large inputs."""
+    try:
+        from azure.storage.blob import ContainerClient
+    except ImportError as e:
+        raise ImportError(
+            "AZURE_BLOB_CONTAINER_URL requires azure-storage-blob "
+            "(install with: uv sync --extra azure-blob)"
+        ) from e
+    return ContainerClient.from_container_url(container_url)
+
+
+def _analyze_via_blob(client, file_path, model_id, container_url):
+    """
+    Stage a large file in blob storage and submit it by URL.
+
+    The upload streams the file in chunks, so peak memory stays at the chunk
+    size instead of the file size. The staged blob is deleted once the analysis
+    has finished.
+
+    Args:
+        client: Azure Document Intelligence client
+        file_path: Path to PDF or image file
+        model_id: Azure model ID
+        container_url: SAS URL of the staging container
+
+    Returns:
+        AnalyzeResult: Analysis result
+    """
+    container = _get_container_client(container_url)
+    blob = container.get_blob_client(f"{uuid.uuid4().hex}{file_path.suffix}")
+
+    with open(file_path, "rb") as file:
+        blob.upload_blob(file, length=file_path.stat().st_size, max_concurrency=4)
+    try:
+        # blob.url carries the container SAS token, so the service can read it
+        poller = client.begin_analyze_document(
+            model_id=model_id,
+            body=AnalyzeDocumentRequest(url_source=blob.url),
+            output_content_format=DocumentContentFormat.MARKDOWN
+        )
+        return poller.result()
+    finally:
+        blob.delete_blob()
+
+
+def analyze_document(file_path, model_id, output_dir, save=True):
+    """
+    Analyze a PDF or image file with the given Azure Document Intelligence model.
+
+    Args:
+        file_path: Path to PDF or image file
+        model_id: Azure model ID (e.g. prebuilt-layout, prebuilt-read)
+        output_dir: Output directory for results
+        save: Whether to save the output to file
+
+    Returns:
+        str: Processed content in Markdown format
+    """
+    settings = get_settings()
+    file_path = Path(file_path)
+    client = get_azure_client()
+
+    container_url = settings.azure.blob_container_url
+    if container_url and file_path.stat().st_size > settings.azure.blob_threshold_mb * 1024 * 1024:
+        result: AnalyzeResult = _analyze_via_blob(client, file_path, model_id, container_url)
+    else:
+        # Pass the open file so the SDK streams the request body
+        with open(file_path, "rb") as file:
+            poller = client.begin_analyze_document(
+                model_id=model_id,
+                body=file,
+                output_content_format=DocumentContentFormat.MARKDOWN
+            )
+        result: AnalyzeResult = poller.result()
+
+    if save:
+        output_path = output_dir / file_path.parent.name
+        output_path.mkdir(parents=True, exist_ok=True)
+        save_markdown(result.content, file_path, output_path)
+
+    return result.content
+
+
+def analyze_documents(file_paths, model_id, output_dir, save=True, max_workers=None):
+    """
+    Analyze multiple files concurrently with the given Azure Document Intelligence model.
+
+    Each submission spends most of its time waiting on the service, so documents
+    are analyzed in parallel threads sharing one client, bounded by
+    ``max_workers`` to stay within the resource's TPS quota.
+
+    Args:
+        file_paths: Paths to PDF or image files
+        model_id: Azure model ID (e.g. prebuilt-layout, prebuilt-read)
+        output_dir: Output directory for results
+        save: Whether to save the outputs to files
+        max_workers: Maximum concurrent submissions (default: from config)
+
+    Returns:
+        list[str]: Processed contents in Markdown format, in input order
+    """
+    settings = get_settings()
+    max_workers = max_workers or settings.azure.max_workers
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(
+            lambda file_path: analyze_document(file_path, model_id, output_dir, save=save),
+            file_paths,
+        ))
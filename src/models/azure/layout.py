@@ -2,21 +2,11 @@
 
 from pathlib import Path
 
-from azure.ai.documentintelligence import DocumentIntelligenceClient
-from azure.ai.documentintelligence.models import AnalyzeResult, DocumentContentFormat
-from azure.core.credentials import AzureKeyCredential
-
 from src.config import get_settings
-from src.utils.file_utils import save_markdown
 
+from .common import analyze_document, analyze_documents, get_azure_client
 
-def get_azure_client():
-    """Get Azure Document Intelligence client."""
-    settings = get_settings()
-    return DocumentIntelligenceClient(
-        endpoint=settings.azure.endpoint,
-        credential=AzureKeyCredential(settings.azure.api_key)
-    )
+__all__ = ["get_azure_client", "process_document", "process_documents"]
 
 
 def process_document(file_path, output_dir=Path("../output/azure"), save=True):
@@ -32,21 +22,23 @@ def process_document(file_path, output_dir=Path("../output/azure"), save=True):
         str: Processed content in Markdown format
     """
     settings = get_settings()
-    file_path = Path(file_path)
-    client = get_azure_client()
+    return analyze_document(file_path, settings.azure.layout_model, output_dir, save=save)
 
-    with open(file_path, "rb") as file:
-        poller = client.begin_analyze_document(
-            model_id=settings.azure.layout_model,
-            body=file,
-            output_content_format=DocumentContentFormat.MARKDOWN
-        )
 
-    result: AnalyzeResult = poller.result()
+def process_documents(file_paths, output_dir=Path("../output/azure"), save=True, max_workers=None):
+    """
+    Process multiple PDF or image files concurrently using Azure Document Intelligence.
 
-    if save:
-        output_path = output_dir / file_path.parent.name
-        output_path.mkdir(parents=True, exist_ok=True)
-        save_markdown(result.content, file_path, output_path)
+    Args:
+        file_paths: Paths to PDF or image files
+        output_dir: Output directory for results
+        save: Whether to save the outputs to files
+        max_workers: Maximum concurrent submissions (default: from config)
 
-    return result.content
\ No newline at end of file
+    Returns:
+        list[str]: Processed contents in Markdown format, in input order
+    """
+    settings = get_settings()
+    return analyze_documents(
+        file_paths, settings.azure.layout_model, output_dir, save=save, max_workers=max_workers
+    )
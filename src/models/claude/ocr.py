@@ -1,14 +1,12 @@
 """Claude Sonnet 4.5 API wrapper - OCR-only Mode."""
 
-import base64
-import io
 from pathlib import Path
 
-from anthropic import Anthropic
-from pdf2image import convert_from_path
-
 from src.config import get_settings
 from src.utils.file_utils import save_markdown
+from src.utils.pdf_utils import render_pdf_to_jpeg
+
+from ._client import IMAGE_SUFFIXES, MEDIA_TYPES, call_page, call_pages, get_anthropic_client
 
 
 # Simplified OCR-only prompt
@@ -51,95 +49,31 @@ def process_document(file_path, output_dir=Path("../output/claude-ocr"), save=Tr
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
 
-    client = Anthropic(api_key=api_key)
-
     # Check if input is image or PDF
-    if file_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}:
+    suffix = file_path.suffix.lower()
+    if suffix in IMAGE_SUFFIXES:
         # Process as single image
         with open(file_path, 'rb') as f:
             image_bytes = f.read()
 
-        # Determine media type
-        media_type_map = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.bmp': 'image/bmp',
-            '.tiff': 'image/tiff',
-            '.tif': 'image/tiff'
-        }
-        media_type = media_type_map.get(file_path.suffix.lower(), 'image/jpeg')
-
-        # Encode to base64 for Anthropic API
-        image_base64 = base64.standard_b64encode(image_bytes).decode('utf-8')
-
-        response = client.messages.create(
-            model=settings.claude.model,
-            max_tokens=settings.claude.max_tokens,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": media_type,
-                                "data": image_base64,
-                            },
-                        },
-                        {
-                            "type": "text",
-                            "text": prompt
-                        }
-                    ]
-                }
-            ]
-        )
+        media_type = MEDIA_TYPES.get(suffix, 'image/jpeg')
 
-        output = response.content[0].text
+        output = call_page(get_anthropic_client(api_key), image_bytes, media_type, prompt)
     else:
-        # Process as PDF (convert all pages to images)
-        images = convert_from_path(file_path, dpi=settings.claude.dpi)
-
-        # Process each page
-        page_outputs = []
-
-        for i, image in enumerate(images):
-            # Convert image to bytes
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format='JPEG')
-            image_bytes = img_byte_arr.getvalue()
-
-            # Encode to base64 for Anthropic API
-            image_base64 = base64.standard_b64encode(image_bytes).decode('utf-8')
-
-            # Process each page individually
-            response = client.messages.create(
-                model=settings.claude.model,
-                max_tokens=settings.claude.max_tokens,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": "image/jpeg",
-                                    "data": image_base64,
-                                },
-                            },
-                            {
-                                "type": "text",
-                                "text": prompt + f"\n\n（これはページ {i+1}/{len(images)} です）"
-                            }
-                        ]
-                    }
-                ]
-            )
-
-            page_outputs.append(f"<!-- ページ {i+1} -->\n{response.content[0].text}")
+        # Process as PDF (rendered in-process with PDFium)
+        page_images = render_pdf_to_jpeg(
+            file_path, settings.claude.dpi, max_long_side=settings.claude.max_long_side
+        )
+
+        # Build the invariant parts of the per-page prompt once
+        n_pages = len(page_images)
+        prompt_prefix = prompt + "\n\n（これはページ "
+        prompt_suffix = f"/{n_pages} です）"
+
+        # Process pages concurrently on one event loop (requests are independent and network-bound)
+        page_prompts = [prompt_prefix + str(i + 1) + prompt_suffix for i in range(n_pages)]
+        texts = call_pages(api_key, page_images, page_prompts)
+        page_outputs = [f"<!-- ページ {i+1} -->\n{text}" for i, text in enumerate(texts)]
 
         # Combine results from all pages
         output = "\n\n---\n\n".join(page_outputs)
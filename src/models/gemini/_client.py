@@ -0,0 +1,103 @@
+"""Shared Gemini client and request helpers for the Gemini wrappers."""
+
+from functools import lru_cache
+from types import MappingProxyType
+
+from google import genai
+from google.genai import errors, types
+from tenacity import retry, retry_if_exception, wait_exponential
+
+from src.config import get_settings
+
+from .._http import get_shared_httpx_client
+
+
+# Supported image inputs and their MIME types
+MIME_TYPES = MappingProxyType({
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.bmp': 'image/bmp',
+    '.tiff': 'image/tiff',
+    '.tif': 'image/tiff',
+})
+IMAGE_SUFFIXES = frozenset(MIME_TYPES)
+
+
+@lru_cache(maxsize=1)
+def get_gemini_client(api_key):
+    """
+    Create the Gemini client once per process.
+
+    Requests go through the process-wide httpx client, so its connection pool
+    (and TLS sessions) stays warm across documents and wrappers. Tests that
+    swap API keys must call ``get_gemini_client.cache_clear()``.
+    """
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(httpx_client=get_shared_httpx_client()),
+    )
+
+
+@lru_cache(maxsize=2048)
+def page_prompt(prompt, page_number, total_pages):
+    """Build (and memoize) the prompt for one page, including its page number."""
+    return f"{prompt}\n\n（これはページ {page_number}/{total_pages} です）"
+
+
+def _is_retryable(error):
+    """Retry rate limiting (429) and server-side (5xx) errors."""
+    return isinstance(error, errors.APIError) and (error.code == 429 or (error.code or 0) >= 500)
+
+
+@retry(
+    retry=retry_if_exception(_is_retryable),
+    wait=wait_exponential(multiplier=1, max=30),
+    stop=lambda retry_state: retry_state.attempt_number >= get_settings().gemini.max_retries,
+    reraise=True,
+)
+def generate_content(client, image, mime_type, text):
+    """
+    Send one image plus instruction text to Gemini.
+
+    With ``GEMINI_STREAM`` enabled (the default) the response is streamed and
+    its chunks are joined once the stream ends, so the connection carries data
+    throughout long generations instead of idling until the full answer is ready.
+    Transient errors (429/5xx) are retried with exponential backoff, up to
+    ``GEMINI_MAX_RETRIES`` attempts; a failed stream is retried from the start.
+
+    Args:
+        client: Shared Gemini client
+        image: Encoded image bytes
+        mime_type: MIME type of ``image``
+        text: Prompt text
+
+    Returns:
+        str: Response text
+    """
+    settings = get_settings()
+    request = dict(
+        model=settings.gemini.model,
+        contents=[
+            types.Part.from_bytes(
+                data=image,
+                mime_type=mime_type,
+            ),
+            text
+        ]
+    )
+    if not settings.gemini.stream:
+        return client.models.generate_content(**request).text
+
+    chunks = [chunk.text for chunk in client.models.generate_content_stream(**request) if chunk.text]
+    return "".join(chunks)
+
+
+def process_page(i, image, text, client):
+    """
+    Process a single JPEG-rendered PDF page with Gemini.
+
+    Returns:
+        tuple: (page index, extracted text)
+    """
+    return i, generate_content(client, image, 'image/jpeg', text)
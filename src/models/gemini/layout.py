@@ -1,14 +1,15 @@
 """Gemini 2.5 Flash API wrapper - Layout Analysis Mode."""
 
-import io
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from google import genai
-from google.genai import types
-from pdf2image import convert_from_path
+import fitz  # PyMuPDF
 
 from src.config import get_settings
-from src.utils.file_utils import save_markdown
+from src.utils.file_utils import markdown_page_writer, save_markdown
+from src.utils.pdf_utils import page_dhash, render_pages_jpeg
+
+from ._client import IMAGE_SUFFIXES, MIME_TYPES, generate_content, get_gemini_client, page_prompt, process_page
 
 
 # Default prompt for document processing with layout analysis
@@ -42,7 +43,9 @@
 """
 
 
-def process_document(file_path, output_dir=Path("../output/gemini"), save=True, prompt=None):
+def process_document(
+    file_path, output_dir=Path("../output/gemini"), save=True, prompt=None, dedup_pages=None
+):
     """
     Process PDF or image file using Gemini 2.5 Flash with layout analysis.
 
@@ -51,6 +54,8 @@ def process_document(file_path, output_dir=Path("../output/gemini"), save=True,
         output_dir: Output directory for results
         save: Whether to save the output to file
         prompt: Custom prompt for processing (uses default if None)
+        dedup_pages: Reuse the output of visually identical PDF pages
+            (default: RENDER_DEDUP_PAGES)
 
     Returns:
         str: Processed content in Markdown format
@@ -62,70 +67,59 @@ def process_document(file_path, output_dir=Path("../output/gemini"), save=True,
     if prompt is None:
         prompt = DEFAULT_PROMPT
 
-    client = genai.Client(api_key=settings.gemini.api_key)
+    if dedup_pages is None:
+        dedup_pages = settings.render.dedup_pages
+
+    client = get_gemini_client(settings.gemini.api_key)
+
+    output_path = output_dir / file_path.parent.name if save else None
 
     # Check if input is image or PDF
-    if file_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}:
+    suffix = file_path.suffix.lower()
+    if suffix in IMAGE_SUFFIXES:
         # Process as single image
         with open(file_path, 'rb') as f:
             image_bytes = f.read()
 
-        # Determine MIME type
-        mime_type_map = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.bmp': 'image/bmp',
-            '.tiff': 'image/tiff',
-            '.tif': 'image/tiff'
-        }
-        mime_type = mime_type_map.get(file_path.suffix.lower(), 'image/jpeg')
-
-        response = client.models.generate_content(
-            model=settings.gemini.model,
-            contents=[
-                types.Part.from_bytes(
-                    data=image_bytes,
-                    mime_type=mime_type,
-                ),
-                prompt
-            ]
-        )
+        mime_type = MIME_TYPES.get(suffix, 'image/jpeg')
 
-        output = response.text
+        output = generate_content(client, image_bytes, mime_type, prompt)
+
+        if output_path is not None:
+            output_path.mkdir(parents=True, exist_ok=True)
+            save_markdown(output, file_path, output_path)
     else:
-        # Process as PDF (convert all pages to images)
-        images = convert_from_path(file_path, dpi=settings.gemini.dpi)
-
-        # Process each page
-        page_outputs = []
-
-        for i, image in enumerate(images):
-            # Convert image to bytes
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format='JPEG')
-            image_bytes = img_byte_arr.getvalue()
-
-            # Process each page individually
-            response = client.models.generate_content(
-                model=settings.gemini.model,
-                contents=[
-                    types.Part.from_bytes(
-                        data=image_bytes,
-                        mime_type='image/jpeg',
-                    ),
-                    prompt + f"\n\n（これはページ {i+1}/{len(images)} です）"
-                ]
-            )
-
-            page_outputs.append(f"<!-- ページ {i+1} -->\n{response.text}")
-
-        # Combine results from all pages
-        output = "\n\n---\n\n".join(page_outputs)
-
-    if save:
-        output_path = output_dir / file_path.parent.name
-        output_path.mkdir(parents=True, exist_ok=True)
-        save_markdown(output, file_path, output_path)
+        # Process as PDF (pages are rendered in a process pool and submitted as they are ready)
+        with fitz.open(file_path) as doc:
+            n_pages = doc.page_count
+        pages = render_pages_jpeg(
+            file_path, n_pages, settings.gemini.dpi, settings.gemini.max_long_side, settings.gemini.jpeg_quality
+        )
+
+        # Process pages concurrently (each request is independent and network-bound);
+        # results are collected in page order and written to the output file immediately
+        with markdown_page_writer(file_path, output_path) as write_page, \
+                ThreadPoolExecutor(max_workers=settings.gemini.max_workers) as executor:
+            futures = []
+            first_seen = {}  # page hash -> future of its first occurrence
+            for i, image in enumerate(pages):
+                key = page_dhash(image) if dedup_pages else None
+                future = first_seen.get(key)
+                if future is None:
+                    # Duplicate pages reuse the first occurrence's request instead of a new API call
+                    future = executor.submit(process_page, i, image, page_prompt(prompt, i + 1, n_pages), client)
+                    if key is not None:
+                        first_seen[key] = future
+                futures.append(future)
+            first_seen = None
+
+            for i in range(n_pages):
+                _, text = futures[i].result()
+                # Drop the finished request so written pages are not kept in memory
+                futures[i] = None
+                write_page(f"<!-- ページ {i+1} -->\n{text}")
+
+        # Whole document (read back from the output file when saved)
+        output = write_page.getvalue()
 
     return output
@@ -1,16 +1,110 @@
 """Qwen Vision-Language Model common utilities."""
 
+import collections
+import gc
+import hashlib
+import importlib.util
+import queue
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache
+
 import torch
 from pathlib import Path
 
 from PIL import Image
-from qwen_vl_utils import process_vision_info
-from transformers import AutoProcessor, Qwen2_5_VLForConditionalGeneration
+from transformers import AutoProcessor, Qwen2_5_VLForConditionalGeneration, StoppingCriteria, StoppingCriteriaList
 
 from src.config import get_settings
+from src.utils.pdf_utils import page_dhash, render_page_rgb, render_pages_rgb
+
+class ModelCache:
+    """
+    Thread-safe, reference-counted cache of loaded models.
+
+    Inference code borrows an entry with ``use()`` (or ``acquire()``/``release()``)
+    so that ``clear()`` can wait for in-flight requests instead of dropping a
+    model out from under them.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._released = threading.Condition(self._lock)
+        self._entries = {}
+        self._refs = collections.Counter()
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def items(self):
+        """Snapshot of ``(name, entry)`` pairs."""
+        with self._lock:
+            return list(self._entries.items())
+
+    def put(self, name, entry):
+        """Add a loaded model entry."""
+        if entry['device'].type == "cuda":
+            # Return VRAM to the driver as soon as the model object is collected
+            weakref.finalize(entry['model'], torch.cuda.empty_cache)
+        with self._lock:
+            self._entries[name] = entry
+
+    def acquire(self, name):
+        """Borrow an entry; every call must be paired with ``release()``."""
+        with self._lock:
+            entry = self._entries[name]
+            self._refs[name] += 1
+            return entry
+
+    def release(self, name):
+        """Return an entry borrowed with ``acquire()``."""
+        with self._lock:
+            self._refs[name] -= 1
+            if self._refs[name] <= 0:
+                del self._refs[name]
+            self._released.notify_all()
+
+    @contextmanager
+    def use(self, name):
+        """Borrow an entry for the duration of a ``with`` block."""
+        entry = self.acquire(name)
+        try:
+            yield entry
+        finally:
+            self.release(name)
+
+    def clear(self, timeout=None):
+        """
+        Drop every entry once no request is using it.
+
+        Args:
+            timeout: Seconds to wait for in-flight requests before evicting
+                anyway (None waits indefinitely)
+
+        Returns:
+            bool: True if all entries were released before eviction
+        """
+        with self._released:
+            idle = self._released.wait_for(lambda: not self._refs, timeout)
+            self._entries.clear()
+            self._refs.clear()
+        # Compiled forwards keep reference cycles; collect them so finalizers run now
+        gc.collect()
+        return idle
+
 
 # Global model cache
-_models_cache = {}
+_models_cache = ModelCache()
+
+# How long clear_model_cache() waits for in-flight requests
+_CLEAR_TIMEOUT_SECONDS = 30
 
 
 def _select_device_and_dtype():
@@ -31,13 +125,83 @@ def _select_device_and_dtype():
     return device, dtype
 
 
+def _resolve_quantization(model_name, device):
+    """
+    Resolve the checkpoint and extra ``from_pretrained`` kwargs for QWEN_QUANTIZATION.
+
+    The vision tower stays in FP16 in every mode; only the language model is
+    quantized. Quantization needs CUDA, so other devices fall back to the
+    unquantized model.
+
+    Returns:
+        tuple: (model name, extra kwargs for ``from_pretrained``)
+    """
+    quantization = get_settings().qwen.quantization
+    if quantization == "none":
+        return model_name, {}
+    if device.type != "cuda":
+        print(f"量子化 ({quantization}) はCUDAでのみ利用可能です。量子化なしで読み込みます。")
+        return model_name, {}
+
+    print(f"量子化モード: {quantization}")
+    if quantization == "int8":
+        from transformers import BitsAndBytesConfig
+
+        return model_name, {
+            "quantization_config": BitsAndBytesConfig(
+                load_in_8bit=True,
+                llm_int8_skip_modules=["visual", "lm_head"],
+            )
+        }
+
+    # awq: pre-quantized checkpoint (its quantization config ships with the weights)
+    if not model_name.endswith("-AWQ"):
+        model_name += "-AWQ"
+    return model_name, {}
+
+
+def _select_attn_implementation(device):
+    """
+    Pick the attention kernel for ``from_pretrained``.
+
+    FlashAttention-2 on CUDA when ``flash_attn`` is installed, otherwise
+    PyTorch SDPA (which itself dispatches to flash/memory-efficient kernels
+    where available).
+    """
+    if device.type == "cuda":
+        torch.backends.cuda.enable_flash_sdp(True)
+        torch.backends.cuda.enable_mem_efficient_sdp(True)
+        if importlib.util.find_spec("flash_attn") is not None:
+            return "flash_attention_2"
+    return "sdpa"
+
+
+def _can_compile(device):
+    """Whether torch.compile is worth enabling (CUDA with PyTorch >= 2.2)."""
+    major, minor = (int(part) for part in torch.__version__.split(".")[:2])
+    return device.type == "cuda" and (major, minor) >= (2, 2)
+
+
+def _warm_up(model_info):
+    """Run a tiny generate() so compilation happens before the first document."""
+    print("ウォームアップ中...")
+    image = Image.new("RGB", (448, 448), "white")
+    inputs = _prepare_inputs(model_info['processor'], [image], [0], 1, "")
+    inputs = {k: v.to(model_info['device']) if hasattr(v, "to") else v for k, v in inputs.items()}
+    with torch.inference_mode():
+        model_info['model'].generate(
+            **inputs, max_new_tokens=16, do_sample=False, cache_implementation="static"
+        )
+
+
 def download_models():
     """Download and cache Qwen models."""
     settings = get_settings()
-    model_name = settings.qwen.model
+    device, dtype = _select_device_and_dtype()
+    model_name, quantization_kwargs = _resolve_quantization(settings.qwen.model, device)
+    attn_implementation = _select_attn_implementation(device)
 
     print(f"Qwenモデルをダウンロード中: {model_name}...")
-    device, dtype = _select_device_and_dtype()
 
     # Check for accelerate availability
     try:
@@ -54,23 +218,39 @@ def download_models():
             qwen25vl_model = Qwen2_5_VLForConditionalGeneration.from_pretrained(
                 model_name,
                 dtype=dtype,
-                device_map="auto"
+                device_map="auto",
+                attn_implementation=attn_implementation,
+                **quantization_kwargs
             )
         else:
+            if quantization_kwargs:
+                raise RuntimeError("量子化モデルの読み込みにはaccelerateが必要です")
             qwen25vl_model = Qwen2_5_VLForConditionalGeneration.from_pretrained(
                 model_name,
-                dtype=dtype
+                dtype=dtype,
+                attn_implementation=attn_implementation
             )
             qwen25vl_model = qwen25vl_model.to(device)
 
+        print(f"Attention実装: {qwen25vl_model.config._attn_implementation}")
+
+        if settings.qwen.compile and _can_compile(device):
+            # Compile forward (generate() calls it once per decode step)
+            qwen25vl_model.forward = torch.compile(
+                qwen25vl_model.forward, mode="reduce-overhead", dynamic=True
+            )
+            print("torch.compileを適用しました")
+
         qwen25vl_processor = AutoProcessor.from_pretrained(model_name)
+        # Left padding keeps batched prompts aligned at the generation boundary
+        qwen25vl_processor.tokenizer.padding_side = "left"
 
-        _models_cache['qwen25vl'] = {
+        _models_cache.put('qwen25vl', {
             'model': qwen25vl_model,
             'processor': qwen25vl_processor,
             'device': device,
             'dtype': dtype
-        }
+        })
         print("Qwen2.5VLモデルのダウンロード完了")
 
     except Exception as e:
@@ -83,14 +263,24 @@ def download_models():
 def initialize_models():
     """Initialize models (run once at startup)."""
     print("モデルを初期化中...")
-    download_models()
+    if get_settings().qwen.backend == "vllm":
+        from .engine_vllm import get_llm
+
+        get_llm()
+    else:
+        download_models()
+        with _models_cache.use('qwen25vl') as model_info:
+            if get_settings().qwen.compile and _can_compile(model_info['device']):
+                _warm_up(model_info)
     print("初期化完了！")
 
 
 def clear_model_cache():
-    """Clear model cache to free memory."""
-    global _models_cache
-    _models_cache.clear()
+    """Clear model cache to free memory (waits for in-flight requests first)."""
+    if not _models_cache.clear(timeout=_CLEAR_TIMEOUT_SECONDS):
+        print("処理中のリクエストが終了しないため、モデルを強制的に解放しました")
+    _page_output_cache.clear()
+    _chat_template_cache.clear()
     if torch.cuda.is_available():
         torch.cuda.empty_cache()
     print("モデルキャッシュをクリアしました")
@@ -120,55 +310,673 @@ def get_model_info():
         print("モデルは読み込まれていません")
 
 
-def process_single_page_qwen(model_info, image, page_num, total_pages, prompt):
-    """Process a single page using Qwen model."""
-    settings = get_settings()
-    model = model_info['model']
-    processor = model_info['processor']
-    device = model_info['device']
+# Prompt-length bucket (tokens) used when the model is compiled
+_PROMPT_BUCKET = 512
+
+
+# Stands in for the page number while the chat template is rendered
+_PAGE_PLACEHOLDER = "\x00PAGE\x00"
+
+
+# Chat template halves keyed by (model path, prompt); see _chat_template_parts
+_chat_template_cache = {}
+
+
+def _chat_template_parts(processor, prompt):
+    """
+    Render the chat template once per model and prompt, split around the page number.
+
+    Only the "page i/n" suffix differs between pages, so the template is
+    applied to a placeholder and each page's text is spliced together from
+    the cached halves instead of re-running ``apply_chat_template``. The
+    cache is keyed by the processor's model path, so it does not keep
+    processor objects alive after ``clear_model_cache()``.
+
+    Returns:
+        tuple[str, str]: Template text before and after the page number
+    """
+    key = (processor.tokenizer.name_or_path, prompt)
+    parts = _chat_template_cache.get(key)
+    if parts is not None:
+        return parts
 
-    # Build messages
     messages = [
         {
             "role": "user",
             "content": [
-                {"type": "image", "image": image},
-                {"type": "text", "text": prompt + f"\n\n（これはページ {page_num + 1}/{total_pages} です）"}
+                {"type": "image"},
+                {"type": "text", "text": prompt + f"\n\n（これはページ {_PAGE_PLACEHOLDER} です）"}
             ]
         }
     ]
-
-    # Prepare prompt
     text = processor.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
-    image_inputs, video_inputs = process_vision_info(messages)
+    head, _, tail = text.rpartition(_PAGE_PLACEHOLDER)
+    _chat_template_cache[key] = (head, tail)
+    return head, tail
+
+
+def _page_texts(processor, prompt, page_nums, total_pages):
+    """Chat-templated prompt text (with one image slot) for each page."""
+    head, tail = _chat_template_parts(processor, prompt)
+    return [f"{head}{page_num + 1}/{total_pages}{tail}" for page_num in page_nums]
+
+
+def _prepare_inputs(processor, images, page_nums, total_pages, prompt):
+    """
+    Tokenize prompts and preprocess images for one batch (CPU only).
+
+    Images go straight to the processor, which applies the same Qwen
+    ``smart_resize`` as ``process_vision_info`` would.
+
+    Returns:
+        BatchFeature: Left-padded model inputs on the CPU
+    """
+    texts = _page_texts(processor, prompt, page_nums, total_pages)
+    image_inputs = [image if image.mode == "RGB" else image.convert("RGB") for image in images]
 
-    # Prepare inputs for batch processing
-    inputs = processor(
-        text=[text],
+    # When compiled, bucket prompt lengths so the static cache/CUDA graphs are reused
+    bucket_kwargs = {"pad_to_multiple_of": _PROMPT_BUCKET} if get_settings().qwen.compile else {}
+
+    return processor(
+        text=texts,
         images=image_inputs,
-        videos=video_inputs,
         padding=True,
         return_tensors="pt",
+        **bucket_kwargs,
     )
-    inputs = {k: v.to(device) if hasattr(v, "to") else v for k, v in inputs.items()}
+
+
+def _pin_inputs(inputs):
+    """Copy CPU tensors into page-locked memory so host-to-device copies can run asynchronously."""
+    return {
+        k: v.pin_memory() if torch.is_tensor(v) and v.device.type == "cpu" else v
+        for k, v in inputs.items()
+    }
+
+
+@lru_cache(maxsize=None)
+def _copy_stream(device):
+    """Side CUDA stream used for host-to-device input copies."""
+    return torch.cuda.Stream(device=device)
+
+
+def _to_device(inputs, device):
+    """
+    Move model inputs to ``device``.
+
+    On CUDA the copies are issued on a side stream, so pinned inputs transfer
+    while the compute stream finishes earlier work; the compute stream then
+    waits on the copy stream before ``generate()`` consumes the tensors.
+    """
+    if device.type != "cuda":
+        return {k: v.to(device) if hasattr(v, "to") else v for k, v in inputs.items()}
+
+    copy_stream = _copy_stream(device)
+    compute_stream = torch.cuda.current_stream(device)
+    with torch.cuda.stream(copy_stream):
+        moved = {k: v.to(device, non_blocking=True) if hasattr(v, "to") else v for k, v in inputs.items()}
+    compute_stream.wait_stream(copy_stream)
+
+    # Tensors allocated on the copy stream are used on the compute stream
+    for v in moved.values():
+        if torch.is_tensor(v):
+            v.record_stream(compute_stream)
+    return moved
+
+
+# Adaptive max_new_tokens: budget per text-layer character (markup and table
+# syntax add tokens on top of the text itself), floor, and rounding step (keeps
+# the number of distinct static-cache sizes small when compiled)
+_TOKENS_PER_TEXT_CHAR = 2
+_MIN_ADAPTIVE_TOKENS = 256
+_ADAPTIVE_TOKENS_STEP = 256
+
+# Repetition stop: longest token cycle detected, minimum repeated span (tokens),
+# and how often (in decode steps) to check
+_REPETITION_MAX_PERIOD = 32
+_REPETITION_MIN_SPAN = 200
+_REPETITION_CHECK_EVERY = 16
+
+
+def _page_token_cap(page):
+    """
+    Estimate ``max_new_tokens`` for a PDF page from its text layer.
+
+    Pages without extractable text (scans, figures) get no estimate, since
+    their output length cannot be predicted from the PDF.
+
+    Returns:
+        int | None: Token cap, or None to use ``QWEN_MAX_NEW_TOKENS``
+    """
+    settings = get_settings()
+    if not settings.qwen.adaptive_max_new_tokens:
+        return None
+    n_chars = sum(len(word) for word in page.get_text("text").split())
+    if n_chars == 0:
+        return None
+    cap = max(_MIN_ADAPTIVE_TOKENS, _TOKENS_PER_TEXT_CHAR * n_chars)
+    cap = -(-cap // _ADAPTIVE_TOKENS_STEP) * _ADAPTIVE_TOKENS_STEP
+    return min(settings.qwen.max_new_tokens, cap)
+
+
+class _RepetitionStoppingCriteria(StoppingCriteria):
+    """Finish rows whose output ends in the same short token cycle repeated over and over."""
+
+    def __init__(self, prompt_length):
+        self.prompt_length = prompt_length
+
+    def __call__(self, input_ids, scores, **kwargs):
+        done = torch.zeros(input_ids.shape[0], dtype=torch.bool, device=input_ids.device)
+        generated = input_ids.shape[1] - self.prompt_length
+        if generated < _REPETITION_MIN_SPAN + _REPETITION_MAX_PERIOD or generated % _REPETITION_CHECK_EVERY:
+            return done
+
+        for period in range(1, _REPETITION_MAX_PERIOD + 1):
+            repeats = -(-_REPETITION_MIN_SPAN // period)
+            tail = input_ids[:, -period * repeats:].reshape(-1, repeats, period)
+            done |= (tail == tail[:, :1]).all(dim=2).all(dim=1)
+        return done
+
+
+def _generate(model_info, inputs, page_nums, max_new_tokens=None):
+    """
+    Run ``generate()`` on prepared inputs and decode one output per page.
+
+    Args:
+        max_new_tokens: Token cap for this batch (defaults to ``QWEN_MAX_NEW_TOKENS``)
+
+    Returns:
+        list[str]: Page outputs (with page markers), in input order
+    """
+    settings = get_settings()
+    model = model_info['model']
+    processor = model_info['processor']
+    device = model_info['device']
+
+    inputs = _to_device(inputs, device)
+
+    # A static KV cache lets the compiled decode step be captured as a CUDA graph
+    generate_kwargs = {"cache_implementation": "static"} if settings.qwen.compile else {}
+
+    # With left padding every row's prompt ends at the same position
+    prompt_length = inputs["input_ids"].shape[1]
+    if settings.qwen.stop_on_repetition:
+        generate_kwargs["stopping_criteria"] = StoppingCriteriaList([_RepetitionStoppingCriteria(prompt_length)])
 
     # Run inference with optimized parameters
-    with torch.no_grad():
+    with torch.inference_mode():
         generated_ids = model.generate(
             **inputs,
-            max_new_tokens=settings.qwen.max_new_tokens,
+            max_new_tokens=max_new_tokens or settings.qwen.max_new_tokens,
             do_sample=settings.qwen.do_sample,
             temperature=settings.qwen.temperature,
             pad_token_id=processor.tokenizer.eos_token_id,
-            use_cache=True
+            use_cache=True,
+            **generate_kwargs
         )
 
-    generated_ids_trimmed = [out_ids[len(in_ids):] for in_ids, out_ids in zip(inputs["input_ids"], generated_ids)]
-    output_text = processor.batch_decode(generated_ids_trimmed, skip_special_tokens=True, clean_up_tokenization_spaces=False)
+    output_texts = processor.batch_decode(
+        generated_ids[:, prompt_length:], skip_special_tokens=True, clean_up_tokenization_spaces=False
+    )
+
+    return [
+        f"<!-- ページ {page_num + 1} -->\n{output_text}"
+        for page_num, output_text in zip(page_nums, output_texts)
+    ]
+
+
+def _relabel_page(page_output, source_num, page_num):
+    """Reuse a page output for a duplicate page, updating its page marker."""
+    marker = f"<!-- ページ {source_num + 1} -->"
+    return f"<!-- ページ {page_num + 1} -->" + page_output[len(marker):]
+
+
+def process_pages_qwen(model_info, images, page_nums, total_pages, prompt):
+    """
+    Process a batch of pages with a single Qwen ``generate()`` call.
+
+    Prompts are left-padded so every row's generated tokens start at the same
+    offset; batching amortizes kernel launches and KV-cache allocation across
+    pages instead of paying them once per page.
+
+    Args:
+        model_info: Cached model entry (model, processor, device, dtype)
+        images: PIL images for the pages in this batch
+        page_nums: Zero-based page numbers matching ``images``
+        total_pages: Total number of pages in the document
+        prompt: Instruction prompt
+
+    Returns:
+        list[str]: Page outputs (with page markers), in input order
+    """
+    inputs = _prepare_inputs(model_info['processor'], images, page_nums, total_pages, prompt)
+    if model_info['device'].type == "cuda":
+        inputs = _pin_inputs(inputs)
+    return _generate(model_info, inputs, page_nums)
+
+
+# Pipeline tuning: items buffered between stages, and how long the
+# preprocessing stage waits to fill a batch before flushing it
+_PIPELINE_QUEUE_SIZE = 4
+_BATCH_WAIT_SECONDS = 0.05
+
+# Qwen2.5-VL emits one visual token per 28x28 pixel patch (14px patches, 2x2 merge)
+_PATCH_SIZE = 28
+# Pages gathered before bucketing (in batches), and the maximum visual token
+# spread allowed within one batch
+_BUCKET_WINDOW = 4
+_BUCKET_TOKEN_SPREAD = 64
+
+# Marks the end of a stage's output
+_DONE = object()
+
+# How often (seconds) a blocked stage checks whether the pipeline was stopped
+_STOP_POLL_SECONDS = 0.1
+
+
+def _put(out_queue, item, stop):
+    """
+    Put ``item`` on a bounded queue, giving up once ``stop`` is set.
+
+    Returns:
+        bool: False if the pipeline was stopped before the item was queued
+    """
+    while not stop.is_set():
+        try:
+            out_queue.put(item, timeout=_STOP_POLL_SECONDS)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(in_queue, stop):
+    """Take the next item from a queue, or ``_DONE`` once ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            return in_queue.get(timeout=_STOP_POLL_SECONDS)
+        except queue.Empty:
+            pass
+    return _DONE
+
+
+def _render_args(settings):
+    """Rendering parameters for Qwen pages (after the page/document argument)."""
+    return (
+        settings.qwen.dpi, settings.qwen.max_long_side, _PATCH_SIZE,
+        settings.qwen.max_pixels, settings.qwen.cap_to_native_resolution,
+    )
+
+
+def render_page_image(page):
+    """
+    Rasterize a PDF page straight into a PIL image.
+
+    The pixmap's raw RGB samples are wrapped directly, skipping the PNG
+    encode/decode round trip. Resolution follows QWEN_DPI, capped at
+    QWEN_MAX_LONG_SIDE pixels, QWEN_MAX_PIXELS in area and (optionally) a
+    scanned page's native resolution: Qwen's visual token count grows with
+    pixel area.
+    """
+    settings = get_settings()
+    # Snap to the patch grid so the processor does not resample off-grid sizes
+    width, height, samples = render_page_rgb(page, *_render_args(settings))
+    return Image.frombytes("RGB", (width, height), samples)
+
+
+def render_page_images(doc, page_nums=None):
+    """
+    Rasterize every page of a PDF to PIL images, in page order.
+
+    Documents opened from a file are rendered in a process pool
+    (RENDER_WORKERS); in-memory documents are rendered on the calling thread.
+
+    Args:
+        doc: Open ``fitz.Document``
+        page_nums: Only render these (0-based) pages (default: all)
+
+    Yields:
+        PIL.Image.Image: Page image, in page order
+    """
+    if page_nums is None:
+        page_nums = range(len(doc))
+
+    if not doc.name:
+        for page_num in page_nums:
+            yield render_page_image(doc[page_num])
+        return
+
+    settings = get_settings()
+    for width, height, samples in render_pages_rgb(
+        doc.name, len(doc), *_render_args(settings), page_nums=page_nums
+    ):
+        yield Image.frombytes("RGB", (width, height), samples)
+
+
+def _text_layer_pages(doc, min_chars):
+    """
+    Collect pages whose embedded text layer can stand in for OCR.
+
+    A page qualifies when it has at least ``min_chars`` non-whitespace
+    characters of selectable text and no embedded images, so nothing on it
+    needs to be read from pixels (scans with an OCR text layer always carry
+    an image and are still sent to the model).
+
+    Returns:
+        dict: ``page_num -> text`` for qualifying pages
+    """
+    text_pages = {}
+    for page in doc:
+        text = page.get_text("text").strip()
+        if len("".join(text.split())) >= min_chars and not page.get_images():
+            text_pages[page.number] = text
+    return text_pages
+
+
+def _visual_tokens(image):
+    """Number of visual tokens Qwen2.5-VL produces for an image."""
+    return (image.width // _PATCH_SIZE) * (image.height // _PATCH_SIZE)
+
+
+def _bucket_pages(pages, batch_size):
+    """
+    Split rendered pages into batches of similar visual token count.
+
+    Batching pages of very different sizes pads every row to the largest one;
+    grouping by token count keeps that padding (and its wasted FLOPs) small.
+
+    Args:
+        pages: ``(page_num, image, token_cap)`` tuples
+        batch_size: Maximum pages per batch
+
+    Returns:
+        list[list]: Batches of ``(page_num, image, token_cap)``, earliest pages first
+    """
+    buckets = []
+    bucket = []
+    for item in sorted(pages, key=lambda item: _visual_tokens(item[1])):
+        if bucket and (
+            len(bucket) == batch_size
+            or _visual_tokens(item[1]) - _visual_tokens(bucket[0][1]) >= _BUCKET_TOKEN_SPREAD
+        ):
+            buckets.append(bucket)
+            bucket = []
+        bucket.append(item)
+    if bucket:
+        buckets.append(bucket)
+
+    # Emit batches holding earlier pages first, so outputs can be streamed sooner
+    buckets.sort(key=lambda bucket: min(item[0] for item in bucket))
+    return buckets
+
+
+class _PageOutputCache:
+    """
+    Process-wide LRU of generated page text, keyed by rendered pixels and prompt.
+
+    Report series often repeat cover pages and boilerplate across documents;
+    an exact pixel match lets those pages skip generation entirely.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+
+    @staticmethod
+    def key(image, prompt):
+        """Cache key for a rendered page under the current Qwen settings."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(get_settings().qwen.model_dump_json().encode("utf-8"))
+        digest.update(prompt.encode("utf-8"))
+        digest.update(f"{image.width}x{image.height}".encode("ascii"))
+        digest.update(image.tobytes())
+        return digest.digest()
+
+    def get(self, key):
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+            return text
+
+    def put(self, key, text, maxsize):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_page_output_cache = _PageOutputCache()
+
+
+def _render_stage(doc, out_queue, stop, prompt, duplicates=None, cached=None, page_keys=None, skip=()):
+    """
+    Stage A: rasterize PDF pages to PIL images (with their token cap estimate).
+
+    Stops early (without rendering the remaining pages) once ``stop`` is set.
+
+    Pages in ``skip`` are neither rendered nor passed on. When
+    ``cached``/``page_keys`` are given, pages found in the page output
+    cache are not passed on; their text is recorded in ``cached`` and the keys
+    of the remaining pages in ``page_keys``. When ``duplicates`` is given,
+    pages identical (by dHash) to an earlier page are not passed on either;
+    they are recorded there as ``page_num -> source page``.
+    """
+    first_seen = {}
+    page_nums = [page_num for page_num in range(len(doc)) if page_num not in skip]
+    images = render_page_images(doc, page_nums)
+    try:
+        for page_num, image in zip(page_nums, images):
+            if stop.is_set():
+                return
+            page = doc[page_num]
+            if cached is not None:
+                key = _page_output_cache.key(image, prompt)
+                text = _page_output_cache.get(key)
+                if text is not None:
+                    cached[page_num] = text
+                    continue
+                page_keys[page_num] = key
+            if duplicates is not None:
+                key = page_dhash(image)
+                if key in first_seen:
+                    duplicates[page_num] = first_seen[key]
+                    continue
+                first_seen[key] = page_num
+            if not _put(out_queue, (page_num, image, _page_token_cap(page)), stop):
+                return
+    except Exception as e:
+        _put(out_queue, e, stop)
+    finally:
+        # Cancel pages still queued for rendering
+        images.close()
+    _put(out_queue, _DONE, stop)
 
-    return f"<!-- ページ {page_num + 1} -->\n{output_text[0]}"
+
+def _preprocess_stage(processor, total_pages, prompt, batch_size, pin_memory, in_queue, out_queue, stop):
+    """Stage B: bucket pages by size and build batched CPU tensors (tokenization, image patching)."""
+    done = False
+    try:
+        while not done:
+            item = _get(in_queue, stop)
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            window = [item]
+
+            # Gather a window of pages to bucket, but do not hold pages back longer than the wait budget
+            deadline = time.monotonic() + _BATCH_WAIT_SECONDS
+            while len(window) < batch_size * _BUCKET_WINDOW:
+                try:
+                    item = in_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    done = True
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                window.append(item)
+
+            buckets = _bucket_pages(window, batch_size)
+            window = None
+            buckets.reverse()
+            while buckets:
+                # Pop each batch so its page images are freed once they are tensors
+                batch = buckets.pop()
+                page_nums = [page_num for page_num, _, _ in batch]
+                images = [image for _, image, _ in batch]
+                token_caps = [token_cap for _, _, token_cap in batch]
+                batch = None
+                inputs = _prepare_inputs(processor, images, page_nums, total_pages, prompt)
+                images = None
+                if pin_memory:
+                    inputs = _pin_inputs(inputs)
+                # The batch runs until its longest page is done
+                max_new_tokens = None if None in token_caps else max(token_caps)
+                if not _put(out_queue, (page_nums, inputs, max_new_tokens), stop):
+                    return
+                inputs = None
+    except Exception as e:
+        _put(out_queue, e, stop)
+    _put(out_queue, _DONE, stop)
+
+
+def _drain(*queues):
+    """Discard everything left in the pipeline queues (frees page images and pinned tensors)."""
+    for q in queues:
+        while True:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                break
+
+
+def process_pdf_qwen(model_info, doc, prompt, on_page=None, dedup_pages=None):
+    """
+    Process every page of a PDF through a render → preprocess → generate pipeline.
+
+    Rendering (fitz, fanned out to a process pool) and preprocessing
+    (tokenization, image patching) run in background threads connected by
+    bounded queues, so the GPU is never idle waiting on CPU work. Generation
+    runs on the calling thread in batches of up to ``QWEN_BATCH_SIZE`` pages.
+    The background stages are stopped and joined before returning, including
+    when generation raises.
+
+    Args:
+        model_info: Cached model entry (model, processor, device, dtype)
+        doc: Open ``fitz.Document``
+        prompt: Instruction prompt
+        on_page: Optional callback receiving each page output, in page order,
+            as soon as it is generated; when given, emitted pages are not kept
+            (except as sources for later duplicate pages)
+        dedup_pages: Reuse the output of visually identical pages
+            (default: RENDER_DEDUP_PAGES)
+
+    Returns:
+        list[str] | None: Page outputs (with page markers), in page order,
+            or None when ``on_page`` is given
+    """
+    settings = get_settings()
+    total_pages = len(doc)
+    rendered = queue.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
+    prepared = queue.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
+
+    # Pages with a usable text layer skip rendering and generation entirely
+    text_pages = (
+        _text_layer_pages(doc, settings.qwen.text_layer_min_chars)
+        if settings.qwen.text_layer_min_chars > 0 else {}
+    )
+    if dedup_pages is None:
+        dedup_pages = settings.render.dedup_pages
+    duplicates = {} if dedup_pages else None
+    use_page_cache = settings.qwen.page_cache_size > 0
+    cached = {} if use_page_cache else None
+    page_keys = {} if use_page_cache else None
+
+    stop = threading.Event()
+    stages = [
+        threading.Thread(
+            target=_render_stage,
+            args=(doc, rendered, stop, prompt, duplicates, cached, page_keys, text_pages),
+            daemon=True,
+        ),
+        threading.Thread(
+            target=_preprocess_stage,
+            args=(
+                model_info['processor'], total_pages, prompt, settings.qwen.batch_size,
+                model_info['device'].type == "cuda", rendered, prepared, stop,
+            ),
+            daemon=True,
+        ),
+    ]
+    for stage in stages:
+        stage.start()
+
+    page_outputs = {}
+    next_page = 0
+
+    def flush():
+        """Emit finished pages in page order, filling in text-layer pages, cache hits and duplicates."""
+        nonlocal next_page
+        while next_page < total_pages:
+            if next_page not in page_outputs:
+                # Cache hits and duplicates are always recorded before any later page is generated
+                if next_page in text_pages:
+                    page_outputs[next_page] = f"<!-- ページ {next_page + 1} -->\n{text_pages[next_page]}"
+                elif cached is not None and next_page in cached:
+                    page_outputs[next_page] = f"<!-- ページ {next_page + 1} -->\n{cached[next_page]}"
+                elif duplicates is not None and next_page in duplicates:
+                    source = duplicates[next_page]
+                    page_outputs[next_page] = _relabel_page(page_outputs[source], source, next_page)
+                else:
+                    break
+            if on_page is not None:
+                on_page(page_outputs[next_page])
+                if duplicates is None:
+                    # Without dedup no later page can refer back to an emitted one
+                    del page_outputs[next_page]
+            next_page += 1
+
+    # Stage C: generate on the calling thread
+    try:
+        while (item := prepared.get()) is not _DONE:
+            if isinstance(item, Exception):
+                raise item
+            page_nums, inputs, max_new_tokens = item
+            for page_num, page_output in zip(page_nums, _generate(model_info, inputs, page_nums, max_new_tokens)):
+                page_outputs[page_num] = page_output
+                if use_page_cache:
+                    # Cache the text without the page marker
+                    text = page_output.split("\n", 1)[1]
+                    _page_output_cache.put(page_keys[page_num], text, settings.qwen.page_cache_size)
+            flush()
+    finally:
+        # Unblock and stop the background stages before the caller closes the document
+        stop.set()
+        _drain(rendered, prepared)
+        for stage in stages:
+            stage.join()
+        _drain(rendered, prepared)
+
+    # Pages not generated at the end of the document follow the last generated batch
+    flush()
+    if on_page is not None:
+        return None
+    return [page_outputs[page_num] for page_num in range(total_pages)]
+
+
+def process_single_page_qwen(model_info, image, page_num, total_pages, prompt):
+    """Process a single page using Qwen model."""
+    return process_pages_qwen(model_info, [image], [page_num], total_pages, prompt)[0]
 
 
 def get_models_cache():
-    """Get the global models cache."""
+    """Get the global models cache (a ``ModelCache``)."""
     return _models_cache
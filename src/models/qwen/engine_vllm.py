@@ -0,0 +1,205 @@
+"""Qwen2.5-VL inference through vLLM (paged KV cache, continuous batching)."""
+
+from functools import lru_cache
+
+from src.config import get_settings
+from src.utils.pdf_utils import page_dhash
+
+from .common import (
+    _page_output_cache,
+    _page_texts,
+    _page_token_cap,
+    _relabel_page,
+    _text_layer_pages,
+    render_page_images,
+)
+
+# Pages handed to one generate() call; vLLM batches within the call, and only
+# this many page images are held in memory at once
+_PAGES_PER_REQUEST = 64
+
+
+@lru_cache(maxsize=1)
+def get_llm():
+    """
+    Create the vLLM engine once per process.
+
+    ``QWEN_QUANTIZATION=awq`` loads the matching -AWQ checkpoint; int8
+    (bitsandbytes) is a transformers-only option and is ignored here.
+    """
+    try:
+        from vllm import LLM
+    except ImportError as e:
+        raise ImportError(
+            "QWEN_BACKEND=vllm requires vllm (install with: uv sync --extra vllm)"
+        ) from e
+
+    settings = get_settings()
+    model_name = settings.qwen.model
+    if settings.qwen.quantization == "awq" and not model_name.endswith("-AWQ"):
+        model_name += "-AWQ"
+    elif settings.qwen.quantization == "int8":
+        print("vLLMバックエンドではint8量子化は未対応です。量子化なしで読み込みます。")
+
+    print(f"vLLMエンジンを初期化中: {model_name}...")
+    return LLM(
+        model=model_name,
+        dtype="float16",
+        max_num_batched_tokens=8192,
+        gpu_memory_utilization=0.9,
+        limit_mm_per_prompt={"image": 1},
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_processor():
+    """Load the processor used only for its chat template."""
+    from transformers import AutoProcessor
+
+    return AutoProcessor.from_pretrained(get_settings().qwen.model)
+
+
+def process_pages_vllm(images, page_nums, total_pages, prompt, max_new_tokens=None):
+    """
+    Process pages with vLLM, submitting them together for continuous batching.
+
+    Args:
+        images: PIL images for the pages
+        page_nums: Zero-based page numbers matching ``images``
+        total_pages: Total number of pages in the document
+        prompt: Instruction prompt
+        max_new_tokens: Optional per-page token caps matching ``images``
+            (None entries use ``QWEN_MAX_NEW_TOKENS``)
+
+    Returns:
+        list[str]: Page outputs (with page markers), in input order
+    """
+    from vllm import SamplingParams
+
+    settings = get_settings()
+    processor = _get_processor()
+
+    inputs = [
+        {"prompt": text, "multi_modal_data": {"image": image if image.mode == "RGB" else image.convert("RGB")}}
+        for text, image in zip(_page_texts(processor, prompt, page_nums, total_pages), images)
+    ]
+
+    temperature = settings.qwen.temperature if settings.qwen.do_sample else 0.0
+    if max_new_tokens is None:
+        sampling_params = SamplingParams(temperature=temperature, max_tokens=settings.qwen.max_new_tokens)
+    else:
+        sampling_params = [
+            SamplingParams(temperature=temperature, max_tokens=cap or settings.qwen.max_new_tokens)
+            for cap in max_new_tokens
+        ]
+    outputs = get_llm().generate(inputs, sampling_params)
+
+    return [
+        f"<!-- ページ {page_num + 1} -->\n{output.outputs[0].text}"
+        for page_num, output in zip(page_nums, outputs)
+    ]
+
+
+def process_pdf_vllm(doc, prompt, on_page=None, dedup_pages=None):
+    """
+    Process every page of a PDF with vLLM.
+
+    Applies the same page-level shortcuts as the transformers pipeline:
+    text-layer pages (QWEN_TEXT_LAYER_MIN_CHARS), the page output cache
+    (QWEN_PAGE_CACHE_SIZE), duplicate pages and adaptive token caps
+    (QWEN_ADAPTIVE_MAX_NEW_TOKENS).
+
+    Args:
+        doc: Open ``fitz.Document``
+        prompt: Instruction prompt
+        on_page: Optional callback receiving each page output, in page order;
+            when given, page outputs are not kept
+        dedup_pages: Reuse the output of visually identical pages
+            (default: RENDER_DEDUP_PAGES)
+
+    Returns:
+        list[str] | None: Page outputs (with page markers), in page order,
+            or None when ``on_page`` is given
+    """
+    settings = get_settings()
+    total_pages = len(doc)
+    emitted = [] if on_page is None else None
+
+    # Pages with a usable text layer skip rendering and generation entirely
+    text_pages = (
+        _text_layer_pages(doc, settings.qwen.text_layer_min_chars)
+        if settings.qwen.text_layer_min_chars > 0 else {}
+    )
+    if dedup_pages is None:
+        dedup_pages = settings.render.dedup_pages
+    first_seen = {} if dedup_pages else None
+    duplicates = {}
+    use_page_cache = settings.qwen.page_cache_size > 0
+    page_keys = {}
+
+    page_outputs = {
+        page_num: f"<!-- ページ {page_num + 1} -->\n{text}" for page_num, text in text_pages.items()
+    }
+    next_page = 0
+
+    def flush():
+        """Emit finished pages in page order, filling in duplicates."""
+        nonlocal next_page
+        while next_page < total_pages:
+            if next_page not in page_outputs:
+                if next_page not in duplicates:
+                    break
+                source = duplicates[next_page]
+                page_outputs[next_page] = _relabel_page(page_outputs[source], source, next_page)
+            if on_page is None:
+                emitted.append(page_outputs[next_page])
+            else:
+                on_page(page_outputs[next_page])
+            if first_seen is None:
+                # Without dedup no later page can refer back to an emitted one
+                del page_outputs[next_page]
+            next_page += 1
+
+    def generate(pending):
+        page_nums, images, caps = zip(*pending)
+        for page_num, page_output in zip(
+            page_nums, process_pages_vllm(images, page_nums, total_pages, prompt, max_new_tokens=caps)
+        ):
+            page_outputs[page_num] = page_output
+            if use_page_cache:
+                # Cache the text without the page marker
+                text = page_output.split("\n", 1)[1]
+                _page_output_cache.put(page_keys.pop(page_num), text, settings.qwen.page_cache_size)
+        flush()
+
+    # Submit pages in chunks so only one chunk of page images is held at a time
+    page_nums = [page_num for page_num in range(total_pages) if page_num not in text_pages]
+    images = render_page_images(doc, page_nums)
+    pending = []
+    try:
+        for page_num, image in zip(page_nums, images):
+            if use_page_cache:
+                key = _page_output_cache.key(image, prompt)
+                text = _page_output_cache.get(key)
+                if text is not None:
+                    page_outputs[page_num] = f"<!-- ページ {page_num + 1} -->\n{text}"
+                    continue
+                page_keys[page_num] = key
+            if first_seen is not None:
+                key = page_dhash(image)
+                if key in first_seen:
+                    duplicates[page_num] = first_seen[key]
+                    continue
+                first_seen[key] = page_num
+            pending.append((page_num, image, _page_token_cap(doc[page_num])))
+            if len(pending) == _PAGES_PER_REQUEST:
+                generate(pending)
+                pending = []
+        if pending:
+            generate(pending)
+    finally:
+        # Cancel pages still queued for rendering
+        images.close()
+
+    flush()
+    return emitted
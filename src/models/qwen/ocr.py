@@ -1,11 +1,14 @@
 """Qwen Vision-Language Model - OCR-only Mode."""
 
-import io
 import fitz  # PyMuPDF
+from contextlib import nullcontext
 from pathlib import Path
 from PIL import Image
-from src.utils.file_utils import save_markdown
-from .common import download_models, process_single_page_qwen, get_models_cache
+from src.config import get_settings
+from src.utils import ocr_cache
+from src.utils.file_utils import markdown_page_writer, save_markdown
+from .common import download_models, process_pdf_qwen, process_single_page_qwen, get_models_cache
+from .engine_vllm import process_pages_vllm, process_pdf_vllm
 
 
 # Simplified OCR-only prompt
@@ -23,7 +26,7 @@
 """
 
 
-def process_document(file_path, output_dir=None, save=False, prompt=None):
+def process_document(file_path, output_dir=None, save=False, prompt=None, dedup_pages=None):
     """
     Process PDF or image file using optimized Qwen2.5-VL with OCR-only mode.
 
@@ -32,6 +35,8 @@ def process_document(file_path, output_dir=None, save=False, prompt=None):
         output_dir: Output directory for results
         save: Whether to save the output to file
         prompt: Custom prompt for processing
+        dedup_pages: Reuse the output of visually identical PDF pages
+            (default: RENDER_DEDUP_PAGES)
 
     Returns:
         str: Processed content in Markdown format
@@ -42,48 +47,66 @@ def process_document(file_path, output_dir=None, save=False, prompt=None):
     if prompt is None:
         prompt = DEFAULT_PROMPT
 
-    # Get models cache
-    _models_cache = get_models_cache()
-
-    # Download models if not cached
-    if 'qwen25vl' not in _models_cache:
-        print("Qwen2.5VLモデルがダウンロードされていません。ダウンロードを開始します...")
-        download_models()
-        _models_cache = get_models_cache()
-
-    model_info = _models_cache['qwen25vl']
-
-    # Check if input is image or PDF
-    if file_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}:
-        # Process as single image
-        image = Image.open(file_path)
-        page_output = process_single_page_qwen(model_info, image, 0, 1, prompt)
-        response_content = page_output
-    else:
-        # Process as PDF
-        doc = fitz.open(file_path)
-        total_pages = len(doc)
-
-        # Process each page
-        page_outputs = []
-
-        for page_num in range(total_pages):
-            page = doc[page_num]
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x resolution
-            img_data = pix.tobytes("png")
-            image = Image.open(io.BytesIO(img_data))
-
-            # Process page
-            page_output = process_single_page_qwen(model_info, image, page_num, total_pages, prompt)
-            page_outputs.append(page_output)
-
-        # Combine results
-        response_content = "\n\n---\n\n".join(page_outputs)
-        doc.close()
-
-    if save and output_dir is not None:
-        output_path = output_dir / file_path.parent.name
-        output_path.mkdir(parents=True, exist_ok=True)
-        save_markdown(response_content, file_path, output_path)
+    settings = get_settings()
+
+    # vLLM manages its own model weights and batching
+    use_vllm = settings.qwen.backend == "vllm"
+
+    output_path = output_dir / file_path.parent.name if save and output_dir is not None else None
+
+    # Reuse an earlier result for the same file, model settings and prompt (OCR_CACHE_ENABLED)
+    cache_key = None
+    if settings.cache.enabled:
+        cache_key = ocr_cache.cache_key(file_path, f"qwen:{settings.qwen.model_dump_json()}", prompt)
+        cached = ocr_cache.load(cache_key)
+        if cached is not None:
+            if output_path is not None:
+                output_path.mkdir(parents=True, exist_ok=True)
+                save_markdown(cached, file_path, output_path)
+            return cached
+
+    model_cache = None
+    if not use_vllm:
+        # Get models cache
+        model_cache = get_models_cache()
+
+        # Download models if not cached
+        if 'qwen25vl' not in model_cache:
+            print("Qwen2.5VLモデルがダウンロードされていません。ダウンロードを開始します...")
+            download_models()
+
+    # Hold a reference to the model while processing so clear_model_cache() waits for us
+    with model_cache.use('qwen25vl') if model_cache is not None else nullcontext() as model_info:
+        # Check if input is image or PDF
+        if file_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}:
+            # Process as single image
+            with Image.open(file_path) as opened:
+                image = opened.convert("RGB")
+            if use_vllm:
+                page_output = process_pages_vllm([image], [0], 1, prompt)[0]
+            else:
+                page_output = process_single_page_qwen(model_info, image, 0, 1, prompt)
+            response_content = page_output
+
+            if output_path is not None:
+                output_path.mkdir(parents=True, exist_ok=True)
+                save_markdown(response_content, file_path, output_path)
+        else:
+            # Process as PDF, writing each page to the output file as soon as it is ready
+            with fitz.open(file_path) as doc, markdown_page_writer(file_path, output_path) as write_page:
+                if use_vllm:
+                    process_pdf_vllm(doc, prompt, on_page=write_page, dedup_pages=dedup_pages)
+                else:
+                    # Render → preprocess → generate pipeline
+                    process_pdf_qwen(model_info, doc, prompt, on_page=write_page, dedup_pages=dedup_pages)
+
+            # Drop MuPDF's cached fonts/images for this document
+            fitz.TOOLS.store_shrink(100)
+
+            # Whole document (read back from the output file when saved)
+            response_content = write_page.getvalue()
+
+    if cache_key is not None:
+        ocr_cache.store(cache_key, response_content)
 
     return response_content
@@ -1,9 +1,13 @@
 """Upstage Document Parse API wrappers."""
 
 from .layout import process_document as process_document_layout
+from .layout import process_documents as process_documents_layout
 from .ocr import process_document as process_document_ocr
+from .ocr import process_documents as process_documents_ocr
 
 __all__ = [
     "process_document_layout",
+    "process_documents_layout",
     "process_document_ocr",
+    "process_documents_ocr",
 ]
@@ -0,0 +1,206 @@
+"""Shared request helpers for the Upstage wrappers."""
+
+import json
+import mimetypes
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+
+import ijson
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+
+from src.config import get_settings
+from src.utils import ocr_cache
+
+
+# Connections kept alive per host (covers UPSTAGE_MAX_WORKERS concurrent uploads)
+_POOL_SIZE = 16
+
+
+@lru_cache(maxsize=1)
+def get_session():
+    """
+    Create the shared ``requests.Session`` once per process.
+
+    Keeping connections alive across documents skips a TCP+TLS handshake per
+    upload; the pool is sized for concurrent uploads from ``process_documents``.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def post_document(file_path, fields):
+    """
+    Upload a document to the Upstage Document Parse endpoint.
+
+    The multipart body is streamed from disk in chunks (``MultipartEncoder``)
+    instead of being assembled in memory, so peak memory stays flat
+    regardless of the document size. With OCR_CACHE_ENABLED, responses are
+    reused for identical file contents, endpoint and form fields.
+
+    Args:
+        file_path: Path to PDF or image file
+        fields: Extra form fields (e.g. ``ocr`` and ``model``)
+
+    Returns:
+        dict: Parsed JSON response
+    """
+    request = json.dumps({"endpoint": get_settings().upstage.endpoint, **fields}, sort_keys=True)
+    return ocr_cache.cached(file_path, f"upstage:{request}", "", lambda: _post_document(file_path, fields))
+
+
+def map_documents(process_document, file_paths, max_workers=None, **kwargs):
+    """
+    Run a wrapper's ``process_document`` over many files concurrently.
+
+    Uploads are network-bound, so they run in parallel threads sharing one
+    keep-alive session, bounded by ``max_workers``.
+
+    Args:
+        process_document: Per-file wrapper function (layout or OCR)
+        file_paths: Paths to PDF or image files
+        max_workers: Maximum concurrent uploads (default: from config)
+        **kwargs: Passed through to ``process_document``
+
+    Returns:
+        list[dict]: Results in input order
+    """
+    max_workers = max_workers or get_settings().upstage.max_workers
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda file_path: process_document(file_path, **kwargs), file_paths))
+
+
+# orjson options for saved responses (indented for readability)
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+def write_json(json_path, result):
+    """
+    Save a parsed response as indented JSON.
+
+    The file is written to a temporary file and renamed into place, so an
+    interrupted write never leaves a truncated ``.json`` behind.
+    """
+    with _atomic_writer(json_path) as out:
+        out.write(orjson.dumps(result, option=_JSON_OPTIONS))
+
+
+def stream_document(file_path, fields, json_path):
+    """
+    Upload a document and stream the JSON response straight to ``json_path``.
+
+    An incremental (``ijson``) parser re-serializes the response to disk as it
+    arrives and picks out the top-level ``text`` field, so the ``pages``
+    array is never materialized as Python objects. The file is byte-for-byte
+    what ``write_json`` would write for the parsed response, and is renamed
+    into place only once the whole response has been read. Bypasses the OCR
+    result cache, which stores parsed responses.
+
+    Args:
+        file_path: Path to PDF or image file
+        fields: Extra form fields (e.g. ``ocr`` and ``model``)
+        json_path: Destination for the JSON response
+
+    Returns:
+        str: Extracted text (empty string when the response has none)
+    """
+    text = ""
+    with _atomic_writer(json_path) as out, _send(file_path, fields, stream=True) as response:
+        response.raw.decode_content = True
+        writer = _IndentedJSONWriter(out)
+        for prefix, event, value in ijson.parse(response.raw, use_float=True):
+            if prefix == "text" and event == "string":
+                text = value
+            writer.write(event, value)
+    return text
+
+
+@contextmanager
+def _atomic_writer(path):
+    """Yield a binary temporary file that is renamed to ``path`` only on success."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class _IndentedJSONWriter:
+    """Serialize ``ijson.parse`` events with the same layout as ``orjson.OPT_INDENT_2``."""
+
+    def __init__(self, out):
+        self._out = out
+        self._depth = 0
+        # Per open container: whether nothing has been written into it yet
+        self._empty = []
+        self._after_key = False
+
+    def _separator(self):
+        """Write the comma/newline/indent preceding an item of the current container."""
+        self._out.write(b"\n" if self._empty[-1] else b",\n")
+        self._out.write(b"  " * self._depth)
+        self._empty[-1] = False
+
+    def _begin_value(self):
+        if self._after_key:
+            # Object member: the value follows its key on the same line
+            self._after_key = False
+        elif self._depth:
+            self._separator()
+
+    def write(self, event, value):
+        if event == "map_key":
+            self._separator()
+            self._out.write(orjson.dumps(value) + b": ")
+            self._after_key = True
+        elif event in ("start_map", "start_array"):
+            self._begin_value()
+            self._out.write(b"{" if event == "start_map" else b"[")
+            self._depth += 1
+            self._empty.append(True)
+        elif event in ("end_map", "end_array"):
+            self._depth -= 1
+            if not self._empty.pop():
+                self._out.write(b"\n" + b"  " * self._depth)
+            self._out.write(b"}" if event == "end_map" else b"]")
+        else:
+            self._begin_value()
+            self._out.write(orjson.dumps(value))
+
+
+def _post_document(file_path, fields):
+    """Send the upload request and parse the response (see ``post_document``)."""
+    return orjson.loads(_send(file_path, fields).content)
+
+
+def _send(file_path, fields, stream=False):
+    """Upload ``file_path`` with ``fields`` and return the checked response."""
+    settings = get_settings()
+    content_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+
+    with open(file_path, "rb") as f:
+        encoder = MultipartEncoder(fields={**fields, "document": (file_path.name, f, content_type)})
+        headers = {
+            "Authorization": f"Bearer {settings.upstage.api_key}",
+            "Content-Type": encoder.content_type,
+        }
+        response = get_session().post(
+            settings.upstage.endpoint, headers=headers, data=encoder, stream=stream
+        )
+
+    if response.status_code != 200:
+        raise Exception(f"Error: {response.status_code} - {response.text}")
+
+    return response
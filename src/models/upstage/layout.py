@@ -1,11 +1,12 @@
 """Upstage Document Parse API wrapper."""
 
-import requests
 from pathlib import Path
 
 from src.config import get_settings
 from src.utils.file_utils import save_html, save_markdown
 
+from ._client import map_documents, post_document
+
 
 def process_document(
     file_path: Path,
@@ -26,20 +27,9 @@ def process_document(
         dict: Processed content with "html" and "markdown" keys
     """
     settings = get_settings()
-    url = settings.upstage.endpoint
-    api_key = settings.upstage.api_key
     model = model or settings.upstage.layout_model
-    headers = {"Authorization": f"Bearer {api_key}"}
-
-    with open(file_path, "rb") as f:
-        files = {"document": f}
-        data = {"ocr": "auto", "model": model}
-        response = requests.post(url, headers=headers, files=files, data=data)
-
-    if response.status_code != 200:
-        raise Exception(f"Error: {response.status_code} - {response.text}")
 
-    response_data = response.json()
+    response_data = post_document(file_path, {"ocr": "auto", "model": model})
     content = response_data["content"]
     html_content = content["html"]
     markdown_content = content.get("markdown", "")
@@ -50,4 +40,31 @@ def process_document(
         save_html(html_content, file_path, output_path)
         save_markdown(markdown_content, file_path, output_path)
 
-    return {"html": html_content, "markdown": markdown_content}
\ No newline at end of file
+    return {"html": html_content, "markdown": markdown_content}
+
+
+def process_documents(
+    file_paths,
+    output_dir: Path = Path("../output/upstage"),
+    model: str | None = None,
+    save: bool = True,
+    max_workers: int | None = None,
+):
+    """
+    Process multiple PDF or image files concurrently using the Upstage API.
+
+    See ``map_documents`` for the concurrency model.
+
+    Args:
+        file_paths: Paths to PDF or image files
+        output_dir: Output directory for results
+        model: Model to use (default: from config)
+        save: Whether to save the outputs to files
+        max_workers: Maximum concurrent uploads (default: from config)
+
+    Returns:
+        list[dict]: Results as returned by ``process_document``, in input order
+    """
+    return map_documents(
+        process_document, file_paths, max_workers, output_dir=output_dir, model=model, save=save
+    )
@@ -1,17 +1,18 @@
 """Upstage Document OCR API wrapper (OCR-only mode)."""
 
-import json
-import requests
 from pathlib import Path
 
 from src.config import get_settings
 
+from ._client import map_documents, post_document, stream_document, write_json
+
 
 def process_document(
     file_path: Path,
     output_dir: Path = Path("../output/upstage-ocr"),
     model: str | None = None,
-    save: bool = True
+    save: bool = True,
+    stream: bool = False,
 ):
     """
     Process PDF or image file using Upstage OCR API (OCR-only mode).
@@ -24,38 +25,67 @@ def process_document(
         output_dir: Output directory for results
         model: Model to use (default: from config)
         save: Whether to save the output to file
+        stream: Stream the response to the JSON file instead of parsing it
+            in memory (large documents; only when saving with the OCR cache
+            disabled). The returned dict then holds only ``text``.
 
     Returns:
         dict: OCR result containing text and page information
     """
     settings = get_settings()
-    url = settings.upstage.endpoint
-    api_key = settings.upstage.api_key
     model = model or settings.upstage.ocr_model
-    headers = {"Authorization": f"Bearer {api_key}"}
-
-    with open(file_path, "rb") as f:
-        files = {"document": f}
-        data = {"ocr": "force", "model": model}
-        response = requests.post(url, headers=headers, files=files, data=data)
-
-    if response.status_code != 200:
-        raise Exception(f"Error: {response.status_code} - {response.text}")
-
-    result = response.json()
-    # OCR model returns: text, pages, confidence, etc. (no content.html/markdown)
-    text = result.get("text", "")
+    fields = {"ocr": "force", "model": model}
 
     if save:
         output_path = output_dir / file_path.parent.name
         output_path.mkdir(parents=True, exist_ok=True)
+        json_file = output_path / f"{file_path.stem}.json"
+
+    if save and stream and not settings.cache.enabled:
+        # Stream the full response to disk and parse only the text field
+        text = stream_document(file_path, fields, json_file)
+        result = {"text": text}
+    else:
+        result = post_document(file_path, fields)
+        # OCR model returns: text, pages, confidence, etc. (no content.html/markdown)
+        text = result.get("text", "")
+        if save:
+            # Save full JSON response for detailed analysis
+            write_json(json_file, result)
 
+    if save:
         # Save as plain text
         text_file = output_path / f"{file_path.stem}.txt"
         text_file.write_text(text, encoding="utf-8")
 
-        # Save full JSON response for detailed analysis
-        json_file = output_path / f"{file_path.stem}.json"
-        json_file.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
-
     return result
+
+
+def process_documents(
+    file_paths,
+    output_dir: Path = Path("../output/upstage-ocr"),
+    model: str | None = None,
+    save: bool = True,
+    max_workers: int | None = None,
+    stream: bool = False,
+):
+    """
+    Process multiple PDF or image files concurrently using the Upstage API.
+
+    See ``map_documents`` for the concurrency model.
+
+    Args:
+        file_paths: Paths to PDF or image files
+        output_dir: Output directory for results
+        model: Model to use (default: from config)
+        save: Whether to save the outputs to files
+        max_workers: Maximum concurrent uploads (default: from config)
+        stream: Stream responses to the JSON files (see ``process_document``)
+
+    Returns:
+        list[dict]: Results as returned by ``process_document``, in input order
+    """
+    return map_documents(
+        process_document, file_paths, max_workers,
+        output_dir=output_dir, model=model, save=save, stream=stream,
+    )
@@ -3,15 +3,16 @@
 # Import logging utilities first to suppress third-party logs
 import src.utils.logging  # noqa: F401 - imported for side effects
 
-import os
-import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 import cv2
 import nest_asyncio
+import numpy as np
+import torch
 from PIL import Image
 from yomitoku import DocumentAnalyzer
-from yomitoku.data.functions import load_image, load_pdf
+from yomitoku.data.functions import load_pdf
 
 from src.config import get_settings
 from src.utils.device import get_device
@@ -20,32 +21,48 @@
 nest_asyncio.apply()
 
 
-def _convert_tif_to_png(tif_path):
+@lru_cache(maxsize=None)
+def get_analyzer(device, visualize):
     """
-    Convert TIF/TIFF image to PNG format.
+    Create the YOMITOKU DocumentAnalyzer once per (device, visualize) pair.
+
+    Loading the detection/recognition weights takes seconds, so the analyzer
+    is reused across documents instead of being rebuilt on every call.
+    """
+    return DocumentAnalyzer(visualize=visualize, device=device)
+
+
+def _run_page(analyzer, img, device, visualize):
+    """Run YOMITOKU on one page, retrying on CPU if the GPU runs out of memory."""
+    try:
+        return analyzer(img)
+    except torch.cuda.OutOfMemoryError:
+        if device == "cpu":
+            raise
+        print("Warning: CUDA out of memory - retrying page on CPU")
+        torch.cuda.empty_cache()
+        return get_analyzer("cpu", visualize)(img)
+
+
+def _load_tif_as_bgr(tif_path):
+    """
+    Load a TIF/TIFF image as a BGR array, matching what ``cv2.imread`` returns.
+
+    The image is converted in memory, without a temporary PNG file.
 
     Args:
         tif_path: Path to TIF/TIFF file
 
     Returns:
-        str: Path to temporary PNG file
+        numpy.ndarray: BGR image
     """
     with Image.open(tif_path) as img:
-        # Convert to RGB if necessary (TIFF can be in various modes)
-        if img.mode not in ('RGB', 'L'):
-            img = img.convert('RGB')
-
-        # Create temporary PNG file
-        temp_fd, temp_path = tempfile.mkstemp(suffix='.png')
-        os.close(temp_fd)  # Close file descriptor, we'll use the path
-
-        # Save as PNG
-        img.save(temp_path, 'PNG')
-
-    return temp_path
+        # TIFF can be in various modes; cv2.imread would always yield 3-channel BGR
+        rgb = np.asarray(img.convert('RGB'))
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
 
 
-def process_document(file_path, output_dir=Path("../output/yomitoku"), save=True):
+def process_document(file_path, output_dir=Path("../output/yomitoku"), save=True, device=None):
     """
     Process PDF or image file using YOMITOKU OCR.
 
@@ -53,79 +70,63 @@ def process_document(file_path, output_dir=Path("../output/yomitoku"), save=True
         file_path: Path to PDF or image file
         output_dir: Output directory for results
         save: Whether to save the output to file
+        device: Device to run on (default: CUDA when available, else CPU)
 
     Returns:
         list: List of processing results for each page/image
     """
     settings = get_settings()
-    device = get_device()
-    analyzer = DocumentAnalyzer(visualize=settings.yomitoku.visualize, device=device)
+    device = device or get_device()
+    analyzer = get_analyzer(device, settings.yomitoku.visualize)
     file_path = Path(file_path)
 
-    temp_png_path = None
+    # Check if input is image or PDF
+    if file_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp'}:
+        # Load image using cv2 directly
+        img = cv2.imread(str(file_path))
+        if img is None:
+            raise ValueError(f"Failed to load image file: {file_path}")
+        imgs = [img]
+    elif file_path.suffix.lower() in {'.tiff', '.tif'}:
+        # Decode TIF in memory (cv2 cannot read every TIFF variant)
+        imgs = [_load_tif_as_bgr(file_path)]
+    else:
+        # Load PDF file
+        imgs = load_pdf(str(file_path))
 
-    try:
-        # Check if input is image or PDF
-        if file_path.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp'}:
-            # Load image using cv2 directly
-            img = cv2.imread(str(file_path))
-            if img is None:
-                raise ValueError(f"Failed to load image file: {file_path}")
-            imgs = [img]
-        elif file_path.suffix.lower() in {'.tiff', '.tif'}:
-            # Convert TIF to PNG first
-            print(f"Converting TIF to PNG for yomitoku processing: {file_path.name}")
-            temp_png_path = _convert_tif_to_png(str(file_path))
-            # Load the converted PNG using cv2 directly
-            img = cv2.imread(temp_png_path)
-            if img is None:
-                raise ValueError(f"Failed to load converted image from TIF file: {file_path}")
-            imgs = [img]
-        else:
-            # Load PDF file
-            imgs = load_pdf(str(file_path))
-
-        # Validate that images were loaded
-        if not imgs or imgs[0] is None:
-            raise ValueError(f"Failed to load images from file: {file_path}")
-
-        output_results = []
-
-        for i, img in enumerate(imgs):
-            if img is None:
-                print(f"Warning: Skipping null image at index {i} for {file_path.name}")
-                continue
-
-            results, ocr_vis, layout_vis = analyzer(img)
-
-            if save:
-                # Create output directory
-                parent_path = output_dir / file_path.parent.name
-                parent_path.mkdir(parents=True, exist_ok=True)
-
-                # Export HTML results
-                output_path = parent_path / (file_path.stem + f"_{i}.html")
-                results.to_html(str(output_path), img=img)
-
-                # Export JSON results (for post-processing)
-                json_output_path = parent_path / (file_path.stem + f"_{i}.json")
-                results.to_json(str(json_output_path))
-
-                # Save visualization images
-                output_ocr_path = parent_path / (file_path.stem + f"_ocr_{i}.jpg")
-                cv2.imwrite(str(output_ocr_path), ocr_vis)
-
-                output_layout_path = parent_path / (file_path.stem + f"_layout_{i}.jpg")
-                cv2.imwrite(str(output_layout_path), layout_vis)
-
-            output_results.append(results)
-
-        return output_results
-
-    finally:
-        # Clean up temporary PNG file if created
-        if temp_png_path and os.path.exists(temp_png_path):
-            try:
-                os.unlink(temp_png_path)
-            except Exception as e:
-                print(f"Warning: Failed to delete temporary file {temp_png_path}: {e}")
\ No newline at end of file
+    # Validate that images were loaded
+    if not imgs or imgs[0] is None:
+        raise ValueError(f"Failed to load images from file: {file_path}")
+
+    output_results = []
+
+    for i, img in enumerate(imgs):
+        if img is None:
+            print(f"Warning: Skipping null image at index {i} for {file_path.name}")
+            continue
+
+        results, ocr_vis, layout_vis = _run_page(analyzer, img, device, settings.yomitoku.visualize)
+
+        if save:
+            # Create output directory
+            parent_path = output_dir / file_path.parent.name
+            parent_path.mkdir(parents=True, exist_ok=True)
+
+            # Export HTML results
+            output_path = parent_path / (file_path.stem + f"_{i}.html")
+            results.to_html(str(output_path), img=img)
+
+            # Export JSON results (for post-processing)
+            json_output_path = parent_path / (file_path.stem + f"_{i}.json")
+            results.to_json(str(json_output_path))
+
+            # Save visualization images
+            output_ocr_path = parent_path / (file_path.stem + f"_ocr_{i}.jpg")
+            cv2.imwrite(str(output_ocr_path), ocr_vis)
+
+            output_layout_path = parent_path / (file_path.stem + f"_layout_{i}.jpg")
+            cv2.imwrite(str(output_layout_path), layout_vis)
+
+        output_results.append(results)
+
+    return output_results
@@ -10,8 +10,8 @@
 
 対応モデルと入力形式:
 - Azure: Markdown (.md) ファイル → プレーンテキストとして抽出
-- Upstage: HTML (.html) ファイル → BeautifulSoupでタグを除去してテキスト抽出
-- YOMITOKU: JSON (.json) ファイル → paragraphs/wordsから読み取り順でテキスト抽出
+- Upstage: HTML (.html) ファイル → selectolaxでタグを除去してテキスト抽出
+- YOMITOKU: JSON (.json) / JSON Lines (.jsonl) ファイル → paragraphs/wordsから読み取り順でテキスト抽出
 
 出力ファイル:
 - 各モデル別: azure_texts.csv/json, upstage_texts.csv/json, yomitoku_texts.csv/json
@@ -24,12 +24,36 @@
 
 import argparse
 import csv
-import json
+import hashlib
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import pairwise, repeat
 from pathlib import Path
 from typing import Any
 
-from bs4 import BeautifulSoup
+import numpy as np
+import orjson
+
+from src.utils.file_utils import scan_files
+from src.utils.html_utils import extract_html_text
+
+
+# Whitespace that normalization would change: any non-space whitespace, or repeated spaces
+_NEEDS_NORMALIZING = re.compile(r"[^\S ]| {2,}")
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+def _normalize_whitespace(text: str) -> str:
+    """
+    Collapse whitespace runs to single spaces and strip (like ``" ".join(text.split())``).
+
+    Text that is already single-spaced is returned without rebuilding it.
+    """
+    if not _NEEDS_NORMALIZING.search(text):
+        return text.strip()
+    return _WHITESPACE_RUN.sub(" ", text).strip()
 
 
 def extract_text_from_markdown(md_content: str) -> str:
@@ -46,13 +70,12 @@ def extract_text_from_markdown(md_content: str) -> str:
         return ""
 
     # Markdown is already plain text, just normalize whitespace
-    text = " ".join(md_content.split())
-    return text.strip()
+    return _normalize_whitespace(md_content)
 
 
 def extract_text_from_html(html_content: str) -> str:
     """
-    Extract text from HTML content using BeautifulSoup.
+    Extract text from HTML content using selectolax.
 
     Args:
         html_content: HTML content string
@@ -60,21 +83,7 @@ def extract_text_from_html(html_content: str) -> str:
     Returns:
         Extracted text with normalized whitespace
     """
-    if not html_content or not html_content.strip():
-        return ""
-
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    # Remove script and style elements
-    for script in soup(["script", "style"]):
-        script.decompose()
-
-    # Get text
-    text = soup.get_text()
-
-    # Normalize whitespace
-    text = " ".join(text.split())
-    return text.strip()
+    return _normalize_whitespace(extract_html_text(html_content))
 
 
 def extract_text_from_yomitoku_words(words: list[dict[str, Any]]) -> str:
@@ -90,50 +99,52 @@ def extract_text_from_yomitoku_words(words: list[dict[str, Any]]) -> str:
     if not words:
         return ""
 
-    # Separate by direction
-    horizontal_words = []
-    vertical_words = []
-
-    for word in words:
-        direction = word.get("direction", "horizontal")
-        points = word.get("points", [])
+    # Skip words without a usable bounding polygon
+    words = [word for word in words if len(word.get("points") or []) >= 4]
+    if not words:
+        return ""
 
-        if not points or len(points) < 4:
-            continue
+    # Sort keys for all words at once
+    center_x, top_y, left_x = _word_sort_keys([word["points"] for word in words])
+    vertical = np.array([word.get("direction", "horizontal") == "vertical" for word in words])
+    vertical_idx = np.flatnonzero(vertical)
+    horizontal_idx = np.flatnonzero(~vertical)
 
-        # Calculate bounding box coordinates for sorting
-        xs = [p[0] for p in points]
-        ys = [p[1] for p in points]
-        center_x = sum(xs) / len(xs)
-        top_y = min(ys)
-        left_x = min(xs)
-
-        word_with_coords = {
-            "word": word,
-            "center_x": center_x,
-            "top_y": top_y,
-            "left_x": left_x,
-        }
-
-        if direction == "vertical":
-            vertical_words.append(word_with_coords)
-        else:
-            horizontal_words.append(word_with_coords)
+    # Sort vertical text: right to left, top to bottom (Japanese reading order)
+    # (np.lexsort is stable and sorts by its last key first)
+    vertical_idx = vertical_idx[np.lexsort((top_y[vertical_idx], -center_x[vertical_idx]))]
 
     # Sort horizontal text: top to bottom, left to right
-    horizontal_words.sort(key=lambda w: (w["top_y"], w["left_x"]))
-
-    # Sort vertical text: right to left, top to bottom (Japanese reading order)
-    vertical_words.sort(key=lambda w: (-w["center_x"], w["top_y"]))
+    horizontal_idx = horizontal_idx[np.lexsort((left_x[horizontal_idx], top_y[horizontal_idx]))]
 
     # Combine: vertical text first (if present), then horizontal
-    sorted_words = vertical_words + horizontal_words
+    order = np.concatenate((vertical_idx, horizontal_idx))
 
     # Extract text content
-    text_parts = [w["word"].get("content", "") for w in sorted_words]
-    text = "".join(text_parts)
+    text = "".join(words[i].get("content", "") for i in order.tolist())
     # Normalize whitespace (same as Azure/Upstage)
-    return " ".join(text.split())
+    return _normalize_whitespace(text)
+
+
+def _word_sort_keys(points: list[list[list[float]]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute per-word center x, top y and left x from their polygons.
+
+    Returns:
+        Arrays ``(center_x, top_y, left_x)``, one entry per word
+    """
+    try:
+        pts = np.asarray(points, dtype=np.float64)
+    except ValueError:
+        # Polygons with differing point counts cannot form one array
+        pts = None
+    if pts is not None and pts.ndim == 3:
+        return pts[:, :, 0].mean(axis=1), pts[:, :, 1].min(axis=1), pts[:, :, 0].min(axis=1)
+
+    center_x = np.array([sum(p[0] for p in poly) / len(poly) for poly in points])
+    top_y = np.array([min(p[1] for p in poly) for poly in points])
+    left_x = np.array([min(p[0] for p in poly) for poly in points])
+    return center_x, top_y, left_x
 
 
 def extract_text_from_yomitoku_paragraphs(paragraphs: list[dict[str, Any]]) -> str:
@@ -149,14 +160,17 @@ def extract_text_from_yomitoku_paragraphs(paragraphs: list[dict[str, Any]]) -> s
     if not paragraphs:
         return ""
 
-    # Sort by order field
-    sorted_paragraphs = sorted(paragraphs, key=lambda p: p.get("order", 0))
+    # Sort by order field (YOMITOKU usually emits paragraphs in order already)
+    orders = [p.get("order", 0) for p in paragraphs]
+    if all(a <= b for a, b in pairwise(orders)):
+        sorted_paragraphs = paragraphs
+    else:
+        sorted_paragraphs = [paragraphs[i] for i in sorted(range(len(orders)), key=orders.__getitem__)]
 
     # Extract contents from each paragraph
-    text_parts = [p.get("contents", "") for p in sorted_paragraphs]
-    text = "".join(text_parts)
+    text = "".join(p.get("contents", "") for p in sorted_paragraphs)
     # Normalize whitespace (same as Azure/Upstage)
-    return " ".join(text.split())
+    return _normalize_whitespace(text)
 
 
 def extract_text_from_yomitoku_json(
@@ -189,8 +203,7 @@ def extract_text_from_yomitoku_json(
 def extract_azure_text(file_path: Path) -> str:
     """Extract text from Azure Markdown output file."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        content = file_path.read_bytes().decode("utf-8")
         return extract_text_from_markdown(content)
     except Exception as e:
         print(f"Error reading Azure file {file_path}: {e}", file=sys.stderr)
@@ -210,33 +223,39 @@ def extract_text_from_upstage_json(data: dict[str, Any]) -> str:
     # Try pages[].text first (OCR mode format)
     pages = data.get("pages", [])
     if pages:
-        text_parts = [page.get("text", "") for page in pages]
-        text = " ".join(text_parts)
-        return " ".join(text.split()).strip()
+        text = " ".join(page.get("text", "") for page in pages)
+        return _normalize_whitespace(text)
 
     # Fallback to text field
-    text = data.get("text", "")
-    return " ".join(text.split()).strip()
+    return _normalize_whitespace(data.get("text", ""))
+
+
+# Extracted text of Upstage HTML files seen in this process, keyed by content hash
+_html_text_memo: dict[bytes, str] = {}
 
 
 def extract_upstage_text(file_path: Path) -> str:
     """Extract text from Upstage output file (HTML or JSON)."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        # Determine format by extension
-        if file_path.suffix.lower() == ".json":
-            data = json.load(open(file_path, "r", encoding="utf-8"))
+        # Determine format by extension (JSON is parsed straight from bytes)
+        suffix = file_path.suffix.lower()
+        if suffix == ".json":
+            data = orjson.loads(file_path.read_bytes())
             return extract_text_from_upstage_json(data)
-        elif file_path.suffix.lower() == ".html":
-            return extract_text_from_html(content)
-        elif file_path.suffix.lower() == ".txt":
+
+        raw = file_path.read_bytes()
+        content = raw.decode("utf-8")
+
+        if suffix == ".txt":
             # Plain text file
-            return " ".join(content.split()).strip()
-        else:
-            # Try HTML parsing as fallback
-            return extract_text_from_html(content)
+            return _normalize_whitespace(content)
+
+        # HTML (also the fallback for unknown suffixes); identical pages are parsed once per process
+        key = hashlib.blake2b(raw, digest_size=16).digest()
+        text = _html_text_memo.get(key)
+        if text is None:
+            text = _html_text_memo[key] = extract_text_from_html(content)
+        return text
     except Exception as e:
         print(f"Error reading Upstage file {file_path}: {e}", file=sys.stderr)
         return ""
@@ -245,81 +264,166 @@ def extract_upstage_text(file_path: Path) -> str:
 def extract_yomitoku_text(file_path: Path, source: str = "paragraphs") -> str:
     """Extract text from YOMITOKU JSON output file.
 
+    For JSON Lines output (``{stem}.jsonl``, one page per line) the first
+    page is used, matching the per-page ``{stem}_0.json`` files.
+
     Args:
-        file_path: Path to YOMITOKU JSON file
+        file_path: Path to YOMITOKU JSON or JSON Lines file
         source: Source to extract from ("paragraphs" or "words")
 
     Returns:
         Extracted text
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if file_path.suffix == ".jsonl":
+            with open(file_path, "rb") as f:
+                data = orjson.loads(f.readline())
+            if data is None:
+                # Page could not be loaded
+                return ""
+        else:
+            data = orjson.loads(file_path.read_bytes())
         return extract_text_from_yomitoku_json(data, source=source)
     except Exception as e:
         print(f"Error reading YOMITOKU file {file_path}: {e}", file=sys.stderr)
         return ""
 
 
-def process_azure_outputs(azure_dir: Path) -> dict[str, str]:
+# Bump when extraction logic changes, so cached texts from older runs are not reused
+_CACHE_VERSION = "1"
+
+
+def _hash_file(file_path: Path):
+    """Hash a file's bytes with BLAKE3 when ``blake3`` is installed, else BLAKE2b."""
+    try:
+        from blake3 import blake3
+    except ImportError:
+        with open(file_path, "rb") as f:
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=32))
+    digest = blake3()
+    digest.update_mmap(file_path)
+    return digest
+
+
+def _cached_extract(extract, cache_dir: Path | None, file_path: Path, *args) -> str:
+    """
+    Run ``extract(file_path, *args)``, reusing the text from an earlier run.
+
+    Texts are stored under ``cache_dir`` keyed by the file content, the
+    extractor and its arguments, so unchanged outputs skip parsing on re-runs.
+    """
+    if cache_dir is None:
+        return extract(file_path, *args)
+
+    digest = _hash_file(file_path)
+    digest.update(f"\0{_CACHE_VERSION}\0{extract.__name__}\0{args!r}".encode("utf-8"))
+    key = digest.hexdigest()
+    cache_path = cache_dir / key[:2] / key
+    try:
+        return cache_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        pass
+
+    text = extract(file_path, *args)
+    # Write to a temporary file and rename, so concurrent workers never read a partial entry
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{key}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+    return text
+
+
+# Below this many files, process pool startup costs more than it saves
+_PARALLEL_MIN_FILES = 64
+# Files handed to a worker per task (amortizes inter-process overhead)
+_CHUNK_SIZE = 16
+
+
+def _map_files(extract, files: list[Path], *args, cache_dir: Path | None = None) -> list[str]:
+    """
+    Apply ``extract(file, *args)`` to every file, in parallel across processes.
+
+    Parsing is CPU-bound, so large directories are spread over a process pool
+    (one worker per CPU); small ones are processed in-process. With
+    ``cache_dir``, texts are reused from earlier runs (see ``_cached_extract``).
+
+    Returns:
+        Extracted texts, in the order of ``files``
+    """
+    workers = min(os.cpu_count() or 1, len(files))
+    if workers <= 1 or len(files) < _PARALLEL_MIN_FILES:
+        return [_cached_extract(extract, cache_dir, file, *args) for file in files]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            _cached_extract, repeat(extract), repeat(cache_dir), files, *(repeat(arg) for arg in args),
+            chunksize=_CHUNK_SIZE,
+        ))
+
+
+def process_azure_outputs(azure_dir: Path, cache_dir: Path | None = None) -> dict[str, str]:
     """
     Process all Azure output files.
 
+    Args:
+        azure_dir: Directory containing Azure output files
+        cache_dir: Directory for cached texts (None disables caching)
+
     Returns:
         Dictionary mapping base filename to extracted text
     """
-    results = {}
-    md_files = sorted(azure_dir.rglob("*.md"))
-
-    for md_file in md_files:
-        base_filename = md_file.stem
-        text = extract_azure_text(md_file)
-        results[base_filename] = text
+    md_files = scan_files(azure_dir, ".md")
+    texts = _map_files(extract_azure_text, md_files, cache_dir=cache_dir)
 
-    return results
+    return {md_file.stem: text for md_file, text in zip(md_files, texts)}
 
 
-def process_upstage_outputs(upstage_dir: Path) -> dict[str, str]:
+def process_upstage_outputs(upstage_dir: Path, cache_dir: Path | None = None) -> dict[str, str]:
     """
     Process all Upstage output files.
 
     Supports both HTML (layout mode) and JSON (OCR mode) formats.
 
+    Args:
+        upstage_dir: Directory containing Upstage output files
+        cache_dir: Directory for cached texts (None disables caching)
+
     Returns:
         Dictionary mapping base filename to extracted text
     """
-    results = {}
+    # Collect both formats in one directory walk
+    html_files = []
+    json_files = []
+    for path in scan_files(upstage_dir, (".html", ".json")):
+        (html_files if path.suffix == ".html" else json_files).append(path)
 
     # Try HTML files first (layout mode)
-    html_files = sorted(upstage_dir.rglob("*.html"))
+    files = {}
     for html_file in html_files:
         base_filename = html_file.stem
         if base_filename.endswith("_0"):
             base_filename = base_filename[:-2]
-
-        text = extract_upstage_text(html_file)
-        results[base_filename] = text
+        files[base_filename] = html_file
 
     # Try JSON files (OCR mode) - only if no HTML found for this file
-    json_files = sorted(upstage_dir.rglob("*.json"))
     for json_file in json_files:
         base_filename = json_file.stem
         if base_filename.endswith("_0"):
             base_filename = base_filename[:-2]
 
         # Skip if already processed via HTML
-        if base_filename in results:
+        if base_filename in files:
             continue
+        files[base_filename] = json_file
 
-        text = extract_upstage_text(json_file)
-        results[base_filename] = text
-
-    return results
+    texts = _map_files(extract_upstage_text, list(files.values()), cache_dir=cache_dir)
+    return dict(zip(files, texts))
 
 
 def process_yomitoku_outputs(
     yomitoku_dir: Path,
     source: str = "paragraphs",
+    cache_dir: Path | None = None,
 ) -> dict[str, str]:
     """
     Process all YOMITOKU output files.
@@ -327,32 +431,36 @@ def process_yomitoku_outputs(
     Args:
         yomitoku_dir: Directory containing YOMITOKU output files
         source: Source to extract from ("paragraphs" or "words")
+        cache_dir: Directory for cached texts (None disables caching)
 
     Returns:
         Dictionary mapping base filename to extracted text
     """
-    results = {}
-    json_files = sorted(yomitoku_dir.rglob("*_0.json"))
+    # Per-page JSON (first page: *_0.json) or JSON Lines with one page per line (*.jsonl)
+    json_files = scan_files(yomitoku_dir, ("_0.json", ".jsonl"))
+    texts = _map_files(extract_yomitoku_text, json_files, source, cache_dir=cache_dir)
 
-    for json_file in json_files:
+    results = {}
+    for json_file, text in zip(json_files, texts):
         # Remove _0 suffix (e.g., "ja_pii_handwriting_0001_0" -> "ja_pii_handwriting_0001")
         base_filename = json_file.stem
-        if base_filename.endswith("_0"):
+        if json_file.suffix == ".json" and base_filename.endswith("_0"):
             base_filename = base_filename[:-2]
-
-        text = extract_yomitoku_text(json_file, source=source)
         results[base_filename] = text
 
     return results
 
 
+# Write buffer for CSV outputs (fewer write syscalls than the 8 KiB default)
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
 def save_model_csv(results: dict[str, str], output_path: Path):
     """Save model results as CSV."""
-    with open(output_path, "w", encoding="utf-8", newline="") as f:
+    with open(output_path, "w", encoding="utf-8", newline="", buffering=_WRITE_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow(["filename", "text"])
-        for filename, text in sorted(results.items()):
-            writer.writerow([filename, text])
+        writer.writerows(sorted(results.items()))
     print(f"Saved: {output_path}")
 
 
@@ -362,11 +470,29 @@ def save_model_json(results: dict[str, str], output_path: Path):
         {"filename": filename, "text": text}
         for filename, text in sorted(results.items())
     ]
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    output_path.write_bytes(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
     print(f"Saved: {output_path}")
 
 
+def _combined_rows(
+    azure_results: dict[str, str],
+    upstage_results: dict[str, str],
+    yomitoku_results: dict[str, str],
+) -> list[tuple[str, str, str, str]]:
+    """Align the per-model results into ``(filename, azure, upstage, yomitoku)`` rows, sorted by filename."""
+    # Get all unique filenames
+    all_filenames = sorted(azure_results.keys() | upstage_results.keys() | yomitoku_results.keys())
+    return [
+        (
+            filename,
+            azure_results.get(filename, ""),
+            upstage_results.get(filename, ""),
+            yomitoku_results.get(filename, ""),
+        )
+        for filename in all_filenames
+    ]
+
+
 def save_combined_csv(
     azure_results: dict[str, str],
     upstage_results: dict[str, str],
@@ -374,21 +500,12 @@ def save_combined_csv(
     output_path: Path,
 ):
     """Save combined results as CSV."""
-    # Get all unique filenames
-    all_filenames = sorted(
-        set(azure_results.keys()) | set(upstage_results.keys()) | set(yomitoku_results.keys())
-    )
+    rows = _combined_rows(azure_results, upstage_results, yomitoku_results)
 
-    with open(output_path, "w", encoding="utf-8", newline="") as f:
+    with open(output_path, "w", encoding="utf-8", newline="", buffering=_WRITE_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerow(["filename", "azure", "upstage", "yomitoku"])
-        for filename in all_filenames:
-            writer.writerow([
-                filename,
-                azure_results.get(filename, ""),
-                upstage_results.get(filename, ""),
-                yomitoku_results.get(filename, ""),
-            ])
+        writer.writerows(rows)
     print(f"Saved: {output_path}")
 
 
@@ -399,22 +516,15 @@ def save_combined_json(
     output_path: Path,
 ):
     """Save combined results as JSON."""
-    # Get all unique filenames
-    all_filenames = sorted(
-        set(azure_results.keys()) | set(upstage_results.keys()) | set(yomitoku_results.keys())
-    )
+    output_data = [
+        {"filename": filename, "azure": azure, "upstage": upstage, "yomitoku": yomitoku}
+        for filename, azure, upstage, yomitoku in _combined_rows(
+            azure_results, upstage_results, yomitoku_results
+        )
+    ]
 
-    output_data = []
-    for filename in all_filenames:
-        output_data.append({
-            "filename": filename,
-            "azure": azure_results.get(filename, ""),
-            "upstage": upstage_results.get(filename, ""),
-            "yomitoku": yomitoku_results.get(filename, ""),
-        })
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    # orjson writes UTF-8 without escaping, like json.dump(ensure_ascii=False)
+    output_path.write_bytes(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
     print(f"Saved: {output_path}")
 
 
@@ -463,10 +573,11 @@ def detect_datasets(input_dir: Path) -> list[str]:
     for model_name in model_names:
         model_dir = find_model_dir(input_dir, model_name)
         if model_dir:
-            subdirs = {
-                d.name for d in model_dir.iterdir()
-                if d.is_dir() and not d.name.startswith(".")
-            }
+            with os.scandir(model_dir) as entries:
+                subdirs = {
+                    entry.name for entry in entries
+                    if entry.is_dir() and not entry.name.startswith(".")
+                }
             if subdirs:
                 dataset_sets.append(subdirs)
 
@@ -474,17 +585,14 @@ def detect_datasets(input_dir: Path) -> list[str]:
         return []
 
     # Find common datasets across all model directories
-    common_datasets = dataset_sets[0]
-    for ds in dataset_sets[1:]:
-        common_datasets = common_datasets & ds
-
-    return sorted(common_datasets)
+    return sorted(set.intersection(*dataset_sets))
 
 
 def process_dataset(
     input_dir: Path,
     output_dir: Path,
     dataset_name: str | None = None,
+    cache_dir: Path | None = None,
 ):
     """
     Process a single dataset and save outputs.
@@ -493,6 +601,7 @@ def process_dataset(
         input_dir: Root input directory
         output_dir: Output directory for this dataset
         dataset_name: Dataset subdirectory name (None for flat structure)
+        cache_dir: Directory for cached texts (None disables caching)
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -518,7 +627,7 @@ def process_dataset(
 
     if azure_dir and azure_dir.exists():
         print(f"  Processing Azure outputs from {azure_dir.name}/...")
-        azure_results = process_azure_outputs(azure_dir)
+        azure_results = process_azure_outputs(azure_dir, cache_dir=cache_dir)
         print(f"    Found {len(azure_results)} files")
 
         save_model_csv(azure_results, output_dir / "azure_texts.csv")
@@ -528,7 +637,7 @@ def process_dataset(
 
     if upstage_dir and upstage_dir.exists():
         print(f"  Processing Upstage outputs from {upstage_dir.name}/...")
-        upstage_results = process_upstage_outputs(upstage_dir)
+        upstage_results = process_upstage_outputs(upstage_dir, cache_dir=cache_dir)
         print(f"    Found {len(upstage_results)} files")
 
         save_model_csv(upstage_results, output_dir / "upstage_texts.csv")
@@ -538,7 +647,7 @@ def process_dataset(
 
     if yomitoku_dir and yomitoku_dir.exists():
         print(f"  Processing YOMITOKU outputs from {yomitoku_dir.name}/...")
-        yomitoku_results = process_yomitoku_outputs(yomitoku_dir)
+        yomitoku_results = process_yomitoku_outputs(yomitoku_dir, cache_dir=cache_dir)
         print(f"    Found {len(yomitoku_results)} files")
 
         save_model_csv(yomitoku_results, output_dir / "yomitoku_texts.csv")
@@ -568,6 +677,11 @@ def main():
         default=None,
         help="Output directory for extracted texts (default: {input_dir}/_extracted)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-extract every file instead of reusing texts cached by earlier runs",
+    )
 
     args = parser.parse_args()
 
@@ -582,6 +696,9 @@ def main():
     else:
         base_output_dir = args.output_dir
 
+    # Extracted texts are cached next to the outputs, keyed by source file content
+    cache_dir = None if args.no_cache else base_output_dir / ".extract_cache"
+
     print("=" * 60)
     print("Text Extraction")
     print("=" * 60)
@@ -600,13 +717,13 @@ def main():
         for dataset_name in datasets:
             print(f"[Dataset: {dataset_name}]")
             output_dir = base_output_dir / dataset_name
-            process_dataset(args.input_dir, output_dir, dataset_name)
+            process_dataset(args.input_dir, output_dir, dataset_name, cache_dir)
             print()
     else:
         # Flat structure - process as before
         print("No dataset subdirectories detected, processing flat structure")
         print()
-        process_dataset(args.input_dir, base_output_dir, None)
+        process_dataset(args.input_dir, base_output_dir, None, cache_dir)
 
     print("=" * 60)
     print("Extraction complete!")
@@ -13,7 +13,7 @@
 from pathlib import Path
 from typing import Any
 
-import Levenshtein
+from rapidfuzz.distance import Levenshtein
 
 
 def normalize_text(text: str) -> str:
@@ -13,8 +13,9 @@
 from pathlib import Path
 from typing import Any
 
-import Levenshtein
-from bs4 import BeautifulSoup
+from rapidfuzz.distance import Levenshtein
+
+from src.utils.html_utils import extract_html_text
 
 
 def normalize_text(text: str) -> str:
@@ -46,22 +47,7 @@ def extract_text_from_html(html_content: str) -> str:
     Returns:
         Extracted text
     """
-    if not html_content or not html_content.strip():
-        return ""
-
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    # Remove script and style elements
-    for script in soup(["script", "style"]):
-        script.decompose()
-
-    # Get text
-    text = soup.get_text()
-
-    # Normalize whitespace
-    text = " ".join(text.split())
-
-    return text.strip()
+    return " ".join(extract_html_text(html_content).split())
 
 
 def extract_text_from_markdown(md_content: str) -> str:
@@ -6,14 +6,21 @@
 
 import argparse
 import csv
-import json
+import os
 import sys
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from html import escape
 from pathlib import Path
 from typing import Any
 
-import Levenshtein
+import numpy as np
+import orjson
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+
+from src.utils.file_utils import scan_files
 
 
 def normalize_text(text: str) -> str:
@@ -29,10 +36,8 @@ def normalize_text(text: str) -> str:
     # Unicode normalization (NFKC: compatibility decomposition followed by canonical composition)
     normalized = unicodedata.normalize("NFKC", text)
 
-    # Normalize whitespace
-    normalized = " ".join(normalized.split())
-
-    return normalized.strip()
+    # Normalize whitespace (split() drops leading/trailing whitespace, so no strip is needed)
+    return " ".join(normalized.split())
 
 
 def extract_from_paragraphs(data: dict[str, Any]) -> tuple[str, dict]:
@@ -96,12 +101,17 @@ def calculate_metrics(predicted: str, ground_truth: str) -> dict[str, Any]:
     pred_norm = normalize_text(predicted)
     gt_norm = normalize_text(ground_truth)
 
-    # Exact match
-    exact_match = pred_norm == gt_norm
-
     # Levenshtein distance
     edit_distance = Levenshtein.distance(pred_norm, gt_norm)
 
+    return _metrics_from_distance(pred_norm, gt_norm, edit_distance)
+
+
+def _metrics_from_distance(pred_norm: str, gt_norm: str, edit_distance: int) -> dict[str, Any]:
+    """Build the metrics dictionary for normalized texts and their edit distance."""
+    # Exact match
+    exact_match = pred_norm == gt_norm
+
     # Character Error Rate (CER)
     # CER = (substitutions + deletions + insertions) / total characters in reference
     cer = edit_distance / len(gt_norm) if len(gt_norm) > 0 else 0.0
@@ -125,8 +135,7 @@ def load_ground_truth(gt_path: Path) -> dict[str, str]:
     Returns:
         Dictionary mapping filename to ground truth text
     """
-    with open(gt_path, "r", encoding="utf-8") as f:
-        gt_data = json.load(f)
+    gt_data = orjson.loads(gt_path.read_bytes())
 
     # Create lookup dictionary: filename -> ground truth
     gt_lookup = {}
@@ -141,6 +150,37 @@ def load_ground_truth(gt_path: Path) -> dict[str, str]:
     return gt_lookup
 
 
+# Below this many files, a process pool costs more than it saves
+_PARALLEL_MIN_FILES = 64
+# Files handed to a worker per task (amortizes inter-process overhead)
+_CHUNK_SIZE = 16
+
+
+def _process_one(json_file: Path, ground_truth: str) -> tuple[str, dict, str, str] | None:
+    """
+    Load a single yomitoku layout output file and prepare it for scoring.
+
+    Args:
+        json_file: Path to the yomitoku layout JSON output
+        ground_truth: Ground truth text for this sample
+
+    Returns:
+        Tuple of (predicted_text, layout_metadata, normalized_predicted,
+        normalized_ground_truth), or None if the file could not be loaded
+    """
+    # Load yomitoku output
+    try:
+        yomitoku_data = orjson.loads(json_file.read_bytes())
+    except Exception as e:
+        print(f"Error loading {json_file}: {e}", file=sys.stderr)
+        return None
+
+    # Extract text from paragraphs
+    predicted_text, layout_metadata = extract_from_paragraphs(yomitoku_data)
+
+    return predicted_text, layout_metadata, normalize_text(predicted_text), normalize_text(ground_truth)
+
+
 def process_yomitoku_outputs(
     yomitoku_dir: Path,
     gt_lookup: dict[str, str]
@@ -148,6 +188,11 @@ def process_yomitoku_outputs(
     """
     Process all yomitoku layout mode output files.
 
+    Loading and normalization are CPU-bound and independent per file, so
+    large directories are spread over a process pool (one worker per CPU);
+    small ones are processed in-process. Edit distances are then computed
+    for all samples in one multi-threaded ``rapidfuzz`` call.
+
     Args:
         yomitoku_dir: Directory containing yomitoku layout JSON outputs
         gt_lookup: Ground truth lookup dictionary
@@ -155,26 +200,13 @@ def process_yomitoku_outputs(
     Returns:
         List of result dictionaries
     """
-    results = []
-
-    # Find all JSON files (pattern: *_0.json)
-    json_files = sorted(yomitoku_dir.rglob("*_0.json"))
-
-    for json_file in json_files:
+    # Find all JSON files (pattern: *_0.json) that have a ground truth
+    json_files = []
+    ground_truths = []
+    for json_file in scan_files(yomitoku_dir, "_0.json"):
         # Extract base filename (remove _0.json suffix)
         base_filename = json_file.stem.rsplit("_", 1)[0]  # "batch_0_sample_0_0" -> "batch_0_sample_0"
 
-        # Load yomitoku output
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                yomitoku_data = json.load(f)
-        except Exception as e:
-            print(f"Error loading {json_file}: {e}", file=sys.stderr)
-            continue
-
-        # Extract text from paragraphs
-        predicted_text, layout_metadata = extract_from_paragraphs(yomitoku_data)
-
         # Get ground truth
         ground_truth = gt_lookup.get(base_filename, "")
 
@@ -182,20 +214,46 @@ def process_yomitoku_outputs(
             print(f"Warning: No ground truth found for {base_filename}", file=sys.stderr)
             continue
 
-        # Calculate metrics
-        metrics = calculate_metrics(predicted_text, ground_truth)
+        json_files.append(json_file)
+        ground_truths.append(ground_truth)
+
+    # Only the matching ground truth is sent along with each file
+    workers = min(os.cpu_count() or 1, len(json_files))
+    if workers <= 1 or len(json_files) < _PARALLEL_MIN_FILES:
+        outputs = list(map(_process_one, json_files, ground_truths))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outputs = list(executor.map(_process_one, json_files, ground_truths, chunksize=_CHUNK_SIZE))
+
+    # Drop files that could not be loaded
+    loaded = [
+        (json_file, ground_truth, output)
+        for json_file, ground_truth, output in zip(json_files, ground_truths, outputs)
+        if output is not None
+    ]
+
+    # Pairwise (not N x N) distances in a single C-level call
+    edit_distances = process.cpdist(
+        [output[2] for _, _, output in loaded],
+        [output[3] for _, _, output in loaded],
+        scorer=Levenshtein.distance,
+        dtype=np.int32,
+        workers=-1,
+    ).tolist()
+
+    results = []
+    for (json_file, ground_truth, output), edit_distance in zip(loaded, edit_distances):
+        predicted_text, layout_metadata, pred_norm, gt_norm = output
 
         # Combine results
-        result = {
-            "filename": base_filename,
+        results.append({
+            "filename": json_file.stem.rsplit("_", 1)[0],
             "json_file": str(json_file.relative_to(yomitoku_dir)),
             "predicted": predicted_text,
             "ground_truth": ground_truth,
-            **metrics,
+            **_metrics_from_distance(pred_norm, gt_norm, edit_distance),
             **layout_metadata,
-        }
-
-        results.append(result)
+        })
 
     return results
 
@@ -214,24 +272,36 @@ def generate_summary_statistics(results: list[dict[str, Any]]) -> dict[str, Any]
         return {}
 
     total_samples = len(results)
-    exact_matches = sum(1 for r in results if r["exact_match"])
 
-    cers = [r["cer"] for r in results]
-    edit_distances = [r["edit_distance"] for r in results]
-
-    paragraph_counts = [r.get("paragraph_count", 0) for r in results]
-    table_counts = [r.get("table_count", 0) for r in results]
-    figure_counts = [r.get("figure_count", 0) for r in results]
+    # One row per sample: exact_match, cer, edit_distance, paragraphs, tables, figures
+    columns = np.fromiter(
+        (
+            (
+                r["exact_match"],
+                r["cer"],
+                r["edit_distance"],
+                r.get("paragraph_count", 0),
+                r.get("table_count", 0),
+                r.get("figure_count", 0),
+            )
+            for r in results
+        ),
+        dtype=np.dtype((np.float64, 6)),
+        count=total_samples,
+    )
+    accuracy, avg_cer, avg_edit_distance, avg_paragraphs, avg_tables, avg_figures = (
+        columns.mean(axis=0).tolist()
+    )
 
     summary = {
         "total_samples": total_samples,
-        "exact_matches": exact_matches,
-        "accuracy": exact_matches / total_samples if total_samples > 0 else 0.0,
-        "avg_cer": sum(cers) / len(cers) if cers else 0.0,
-        "avg_edit_distance": sum(edit_distances) / len(edit_distances) if edit_distances else 0.0,
-        "avg_paragraph_count": sum(paragraph_counts) / len(paragraph_counts) if paragraph_counts else 0.0,
-        "avg_table_count": sum(table_counts) / len(table_counts) if table_counts else 0.0,
-        "avg_figure_count": sum(figure_counts) / len(figure_counts) if figure_counts else 0.0,
+        "exact_matches": int(columns[:, 0].sum()),
+        "accuracy": accuracy,
+        "avg_cer": avg_cer,
+        "avg_edit_distance": avg_edit_distance,
+        "avg_paragraph_count": avg_paragraphs,
+        "avg_table_count": avg_tables,
+        "avg_figure_count": avg_figures,
     }
 
     return summary
@@ -239,8 +309,8 @@ def generate_summary_statistics(results: list[dict[str, Any]]) -> dict[str, Any]
 
 def save_json_output(results: list[dict[str, Any]], output_path: Path):
     """Save detailed results as JSON."""
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    # orjson writes UTF-8 without escaping, like json.dump(ensure_ascii=False)
+    output_path.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
     print(f"Saved JSON output to: {output_path}")
 
 
@@ -262,129 +332,147 @@ def save_csv_output(results: list[dict[str, Any]], output_path: Path):
     ]
 
     with open(output_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        writer.writeheader()
-        writer.writerows(results)
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        # Project each result to the CSV columns (blank if missing, as DictWriter did)
+        writer.writerows(
+            (
+                r["filename"],
+                r["exact_match"],
+                r["edit_distance"],
+                r["cer"],
+                r["predicted"],
+                r["ground_truth"],
+                r.get("paragraph_count", ""),
+                r.get("table_count", ""),
+                r.get("figure_count", ""),
+            )
+            for r in results
+        )
 
     print(f"Saved CSV output to: {output_path}")
 
 
-def save_html_output(results: list[dict[str, Any]], summary: dict[str, Any], output_path: Path):
-    """Save results as HTML visualization."""
-    html_content = f"""<!DOCTYPE html>
+# Static <head> of the HTML report (built once, not per call)
+_HTML_HEAD = """<!DOCTYPE html>
 <html lang="ja">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>YOMITOKU Layout Mode Evaluation Results</title>
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             max-width: 1400px;
             margin: 0 auto;
             padding: 20px;
             background-color: #f5f5f5;
-        }}
-        h1 {{
+        }
+        h1 {
             color: #333;
             text-align: center;
             margin-bottom: 30px;
-        }}
-        .summary {{
+        }
+        .summary {
             background: white;
             padding: 20px;
             border-radius: 8px;
             margin-bottom: 30px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .summary-grid {{
+        }
+        .summary-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 15px;
-        }}
-        .stat {{
+        }
+        .stat {
             text-align: center;
-        }}
-        .stat-label {{
+        }
+        .stat-label {
             font-size: 14px;
             color: #666;
             margin-bottom: 5px;
-        }}
-        .stat-value {{
+        }
+        .stat-value {
             font-size: 24px;
             font-weight: bold;
             color: #2c3e50;
-        }}
-        .comparison {{
+        }
+        .comparison {
             background: white;
             padding: 20px;
             margin-bottom: 20px;
             border-radius: 8px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .comparison.match {{
+        }
+        .comparison.match {
             border-left: 5px solid #27ae60;
-        }}
-        .comparison.mismatch {{
+        }
+        .comparison.mismatch {
             border-left: 5px solid #e74c3c;
-        }}
-        .filename {{
+        }
+        .filename {
             font-weight: bold;
             margin-bottom: 10px;
             color: #2c3e50;
-        }}
-        .text-comparison {{
+        }
+        .text-comparison {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 20px;
             margin-top: 15px;
-        }}
-        .text-box {{
+        }
+        .text-box {
             padding: 15px;
             border-radius: 4px;
             background-color: #f8f9fa;
-        }}
-        .text-box h3 {{
+        }
+        .text-box h3 {
             margin-top: 0;
             margin-bottom: 10px;
             font-size: 14px;
             color: #666;
-        }}
-        .text-content {{
+        }
+        .text-content {
             font-family: 'Noto Sans JP', sans-serif;
             line-height: 1.6;
             word-break: break-all;
-        }}
-        .metrics {{
+        }
+        .metrics {
             margin-top: 15px;
             padding: 10px;
             background-color: #f8f9fa;
             border-radius: 4px;
             font-size: 13px;
-        }}
-        .metrics span {{
+        }
+        .metrics span {
             margin-right: 15px;
-        }}
-        .match-badge {{
+        }
+        .match-badge {
             display: inline-block;
             padding: 4px 8px;
             border-radius: 4px;
             font-size: 12px;
             font-weight: bold;
             margin-left: 10px;
-        }}
-        .match-badge.yes {{
+        }
+        .match-badge.yes {
             background-color: #d4edda;
             color: #155724;
-        }}
-        .match-badge.no {{
+        }
+        .match-badge.no {
             background-color: #f8d7da;
             color: #721c24;
-        }}
+        }
     </style>
 </head>
 <body>
-    <h1>YOMITOKU Layout Mode Evaluation Results</h1>
+"""
+
+
+def save_html_output(results: list[dict[str, Any]], summary: dict[str, Any], output_path: Path):
+    """Save results as HTML visualization."""
+    parts = [_HTML_HEAD, f"""    <h1>YOMITOKU Layout Mode Evaluation Results</h1>
 
     <div class="summary">
         <h2>Summary Statistics</h2>
@@ -417,28 +505,31 @@ def save_html_output(results: list[dict[str, Any]], summary: dict[str, Any], out
     </div>
 
     <h2>Detailed Comparisons</h2>
-"""
+"""]
 
     for result in results:
         match_class = "match" if result["exact_match"] else "mismatch"
         match_badge_class = "yes" if result["exact_match"] else "no"
         match_text = "✓ Match" if result["exact_match"] else "✗ Mismatch"
 
-        html_content += f"""
+        ground_truth = escape(result["ground_truth"], quote=False)
+        predicted = escape(result["predicted"], quote=False)
+
+        parts.append(f"""
     <div class="comparison {match_class}">
         <div class="filename">
-            {result['filename']}
+            {escape(result['filename'], quote=False)}
             <span class="match-badge {match_badge_class}">{match_text}</span>
         </div>
 
         <div class="text-comparison">
             <div class="text-box">
                 <h3>Ground Truth</h3>
-                <div class="text-content">{result['ground_truth']}</div>
+                <div class="text-content">{ground_truth}</div>
             </div>
             <div class="text-box">
                 <h3>Predicted</h3>
-                <div class="text-content">{result['predicted'] or '<em>(empty)</em>'}</div>
+                <div class="text-content">{predicted or '<em>(empty)</em>'}</div>
             </div>
         </div>
 
@@ -450,15 +541,15 @@ def save_html_output(results: list[dict[str, Any]], summary: dict[str, Any], out
             <span><strong>Figures:</strong> {result.get('figure_count', 0)}</span>
         </div>
     </div>
-"""
+""")
 
-    html_content += """
+    parts.append("""
 </body>
 </html>
-"""
+""")
 
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
+        f.write("".join(parts))
 
     print(f"Saved HTML output to: {output_path}")
 
@@ -562,8 +653,7 @@ def main():
 
     # Summary JSON
     summary_path = args.output_dir / f"summary_{timestamp}.json"
-    with open(summary_path, "w", encoding="utf-8") as f:
-        json.dump(summary, f, ensure_ascii=False, indent=2)
+    summary_path.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
     print(f"Saved summary to: {summary_path}")
 
     print()
@@ -13,7 +13,10 @@
 from pathlib import Path
 from typing import Any
 
-import Levenshtein
+import orjson
+from rapidfuzz.distance import Levenshtein
+
+from src.utils.file_utils import scan_files
 
 
 def normalize_text(text: str) -> str:
@@ -202,23 +205,29 @@ def process_yomitoku_outputs(
     """
     results = []
 
-    # Find all JSON files (pattern: *_0.json)
-    json_files = sorted(yomitoku_dir.rglob("*_0.json"))
+    # Find all JSON files (pattern: *_0.json per page, or *.jsonl with one line per page)
+    json_files = scan_files(yomitoku_dir, ("_0.json", ".jsonl"))
 
     for json_file in json_files:
         # Extract base filename (remove _0.json suffix)
-        base_filename = json_file.stem.rsplit("_", 1)[0]  # "batch_0_sample_0_0" -> "batch_0_sample_0"
+        if json_file.suffix == ".jsonl":
+            base_filename = json_file.stem
+        else:
+            base_filename = json_file.stem.rsplit("_", 1)[0]  # "batch_0_sample_0_0" -> "batch_0_sample_0"
 
-        # Load yomitoku output
+        # Load yomitoku output (first page)
         try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                yomitoku_data = json.load(f)
+            if json_file.suffix == ".jsonl":
+                with open(json_file, "rb") as f:
+                    yomitoku_data = orjson.loads(f.readline())
+            else:
+                yomitoku_data = orjson.loads(json_file.read_bytes())
         except Exception as e:
             print(f"Error loading {json_file}: {e}", file=sys.stderr)
             continue
 
-        # Extract and sort text
-        words = yomitoku_data.get("words", [])
+        # Extract and sort text (a "null" line means the page could not be loaded)
+        words = yomitoku_data.get("words", []) if yomitoku_data is not None else []
         predicted_text, ocr_metadata = extract_and_sort_text(words, min_score)
 
         # Get ground truth
@@ -34,7 +34,6 @@
 import matplotlib.pyplot as plt
 from pathlib import Path
 from PIL import Image
-import io
 
 
 def extract_pages(pdf_path, page_numbers, output_dir=None):
@@ -161,12 +160,12 @@ def display_pdf_pages(pdf_path, page_numbers=None, figsize=(10, 14), dpi_scale=2
         # Convert to 0-based indices
         pages_to_display = [p - 1 for p in page_numbers if 0 < p <= pdf_document.page_count]
 
+    matrix = fitz.Matrix(dpi_scale, dpi_scale)
     for page_num in pages_to_display:
         page = pdf_document[page_num]
-        pix = page.get_pixmap(matrix=fitz.Matrix(dpi_scale, dpi_scale))
-        img_data = pix.pil_tobytes(format="PNG")
-
-        img = Image.open(io.BytesIO(img_data))
+        pix = page.get_pixmap(matrix=matrix, alpha=False)
+        # Wrap the raw RGB samples directly (no PNG encode/decode round trip)
+        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
 
         plt.figure(figsize=figsize)
         plt.imshow(img)
@@ -203,17 +202,15 @@ def pdf_to_images(pdf_path, output_dir=None, dpi_scale=2):
     pdf_document = fitz.open(pdf_path)
     output_paths = []
 
+    matrix = fitz.Matrix(dpi_scale, dpi_scale)
     for page_num in range(pdf_document.page_count):
         page = pdf_document[page_num]
-        pix = page.get_pixmap(matrix=fitz.Matrix(dpi_scale, dpi_scale))
-        img_data = pix.pil_tobytes(format="PNG")
-
-        img = Image.open(io.BytesIO(img_data))
+        pix = page.get_pixmap(matrix=matrix)
 
-        # Save image
+        # Save image (MuPDF writes the PNG directly, without a PIL round trip)
         page_number = page_num + 1
         image_path = output_dir / f"page_{page_number:03d}.png"
-        img.save(image_path)
+        pix.save(str(image_path))
 
         output_paths.append(image_path)
         print(f"Page {page_number} saved as image: {image_path}")
@@ -10,45 +10,21 @@
         sys.path.insert(0, str(project_root))
 
 import argparse
+import importlib
 from datetime import datetime
 
 # Import logging utilities first to suppress third-party logs
 from src.utils.logging import (
-    log, log_success, log_warning, log_error,
+    log, log_warning,
     log_processing, log_model_start, log_model_complete,
     log_model_error, log_file_complete
 )
 
-from src.models.upstage import (
-    process_document_layout as process_upstage_layout,
-    process_document_ocr as process_upstage_ocr
-)
-from src.models.azure import (
-    process_document_layout as process_azure_layout,
-    process_document_ocr as process_azure_ocr
-)
-from src.models.yomitoku import (
-    process_document_layout as process_yomitoku_layout,
-    process_document_ocr as process_yomitoku_ocr
-)
-from src.models.gemini import (
-    process_document_layout as process_gemini_layout,
-    process_document_ocr as process_gemini_ocr
-)
-from src.models.claude import (
-    process_document_layout as process_claude_layout,
-    process_document_ocr as process_claude_ocr
-)
-from src.models.qwen import (
-    process_document_layout as process_qwen_layout,
-    process_document_ocr as process_qwen_ocr,
-    initialize_models,
-    optimize_for_speed
-)
 from src.utils.timing import measure_time, save_timing_results, print_timing_summary
 
 
-def run_selected_models_timed_with_datetime(file_list, selected_models, base_output_dir=None, optimize=False):
+def run_selected_models_timed_with_datetime(file_list, selected_models, base_output_dir=None, optimize=False,
+                                            dedup_pages=False):
     """
     Run selected models with timing and datetime-based output folders.
 
@@ -57,6 +33,8 @@ def run_selected_models_timed_with_datetime(file_list, selected_models, base_out
         selected_models: List of model names to run
         base_output_dir: Base output directory (defaults to ../output/{timestamp})
         optimize: Apply speed optimizations (for Qwen models)
+        dedup_pages: Reuse the output of identical pages instead of re-running the
+            model (Gemini and Qwen PDF processing; overrides RENDER_DEDUP_PAGES)
 
     Returns:
         dict: Timing data for all processing
@@ -81,6 +59,8 @@ def run_selected_models_timed_with_datetime(file_list, selected_models, base_out
 
     # Initialize Qwen models if selected
     if "qwen" in selected_models or "qwen-ocr" in selected_models:
+        from src.models.qwen import initialize_models, optimize_for_speed
+
         log("Initializing Qwen models...")
         initialize_models()
 
@@ -88,70 +68,95 @@ def run_selected_models_timed_with_datetime(file_list, selected_models, base_out
             log("Applying speed optimization settings...")
             optimize_for_speed()
 
-    # Define model configurations
+    # Define model configurations (modules are imported only for selected models,
+    # so running one backend does not pay for every other SDK's import time)
     model_configs = {
         "upstage": {
             "name": "Upstage/Document Parse (Layout)",
-            "function": process_upstage_layout,
+            "module": "src.models.upstage",
+            "function": "process_document_layout",
             "output_subdir": "upstage"
         },
         "upstage-ocr": {
             "name": "Upstage/Document OCR",
-            "function": process_upstage_ocr,
+            "module": "src.models.upstage",
+            "function": "process_document_ocr",
             "output_subdir": "upstage-ocr"
         },
         "azure": {
             "name": "Azure/Document Intelligence (Layout)",
-            "function": process_azure_layout,
+            "module": "src.models.azure",
+            "function": "process_document_layout",
             "output_subdir": "azure"
         },
         "azure-ocr": {
             "name": "Azure/Document Intelligence (OCR)",
-            "function": process_azure_ocr,
+            "module": "src.models.azure",
+            "function": "process_document_ocr",
             "output_subdir": "azure-ocr"
         },
         "yomitoku": {
             "name": "YOMITOKU (Layout)",
-            "function": process_yomitoku_layout,
+            "module": "src.models.yomitoku",
+            "function": "process_document_layout",
             "output_subdir": "yomitoku"
         },
         "yomitoku-ocr": {
             "name": "YOMITOKU (OCR)",
-            "function": process_yomitoku_ocr,
+            "module": "src.models.yomitoku",
+            "function": "process_document_ocr",
             "output_subdir": "yomitoku-ocr"
         },
         "gemini": {
             "name": "Gemini 2.5 Flash (Layout)",
-            "function": process_gemini_layout,
-            "output_subdir": "gemini"
+            "module": "src.models.gemini",
+            "function": "process_document_layout",
+            "output_subdir": "gemini",
+            "dedup_pages": True
         },
         "gemini-ocr": {
             "name": "Gemini 2.5 Flash (OCR)",
-            "function": process_gemini_ocr,
-            "output_subdir": "gemini-ocr"
+            "module": "src.models.gemini",
+            "function": "process_document_ocr",
+            "output_subdir": "gemini-ocr",
+            "dedup_pages": True
         },
         "claude": {
             "name": "Claude Sonnet 4.5 (Layout)",
-            "function": process_claude_layout,
+            "module": "src.models.claude",
+            "function": "process_document_layout",
             "output_subdir": "claude"
         },
         "claude-ocr": {
             "name": "Claude Sonnet 4.5 (OCR)",
-            "function": process_claude_ocr,
+            "module": "src.models.claude",
+            "function": "process_document_ocr",
             "output_subdir": "claude-ocr"
         },
         "qwen": {
             "name": "Qwen2.5VL (Layout)",
-            "function": process_qwen_layout,
-            "output_subdir": "qwen25vl"
+            "module": "src.models.qwen",
+            "function": "process_document_layout",
+            "output_subdir": "qwen25vl",
+            "dedup_pages": True
         },
         "qwen-ocr": {
             "name": "Qwen2.5VL (OCR)",
-            "function": process_qwen_ocr,
-            "output_subdir": "qwen25vl-ocr"
+            "module": "src.models.qwen",
+            "function": "process_document_ocr",
+            "output_subdir": "qwen25vl-ocr",
+            "dedup_pages": True
         }
     }
 
+    model_functions = {
+        model_key: getattr(
+            importlib.import_module(model_configs[model_key]["module"]),
+            model_configs[model_key]["function"],
+        )
+        for model_key in selected_models
+    }
+
     for file_idx, file_path in enumerate(file_list):
         file_path = Path(file_path)
         log_processing(str(file_path), file_idx + 1, len(file_list))
@@ -168,11 +173,14 @@ def run_selected_models_timed_with_datetime(file_list, selected_models, base_out
             log_model_start(config['name'])
 
             try:
+                # Only the wrappers that support page dedup take the flag
+                extra_kwargs = {"dedup_pages": True} if dedup_pages and config.get("dedup_pages") else {}
                 _, exec_time = measure_time(
-                    config['function'],
+                    model_functions[model_key],
                     file_path,
                     output_dir=base_output_dir / config['output_subdir'],
-                    save=True
+                    save=True,
+                    **extra_kwargs
                 )
                 file_result["models"][model_key] = {
                     "status": "success",
@@ -238,6 +246,8 @@ def main_layout():
                        help="Apply speed optimizations (for Qwen models)")
     parser.add_argument("--n-samples", type=int, default=None,
                        help="Process only first N files (default: all)")
+    parser.add_argument("--dedup-pages", action="store_true",
+                       help="Reuse output for visually identical PDF pages (Gemini, Qwen)")
 
     args = parser.parse_args()
 
@@ -260,7 +270,8 @@ def main_layout():
     image_count = len(document_files) - pdf_count
     log(f"Found {len(document_files)} file(s): {pdf_count} PDF(s), {image_count} image(s)")
 
-    run_selected_models_timed_with_datetime(document_files, selected_models, args.output_dir, args.optimize)
+    run_selected_models_timed_with_datetime(document_files, selected_models, args.output_dir, args.optimize,
+                                            args.dedup_pages)
 
 
 def main_ocr():
@@ -278,6 +289,8 @@ def main_ocr():
                        help="Apply speed optimizations (for Qwen models)")
     parser.add_argument("--n-samples", type=int, default=None,
                        help="Process only first N files (default: all)")
+    parser.add_argument("--dedup-pages", action="store_true",
+                       help="Reuse output for visually identical PDF pages (Gemini, Qwen)")
 
     args = parser.parse_args()
 
@@ -300,7 +313,8 @@ def main_ocr():
     image_count = len(document_files) - pdf_count
     log(f"Found {len(document_files)} file(s): {pdf_count} PDF(s), {image_count} image(s)")
 
-    run_selected_models_timed_with_datetime(document_files, selected_models, args.output_dir, args.optimize)
+    run_selected_models_timed_with_datetime(document_files, selected_models, args.output_dir, args.optimize,
+                                            args.dedup_pages)
 
 
 def main():
@@ -318,6 +332,8 @@ def main():
                        help="Apply speed optimizations (for Qwen models)")
     parser.add_argument("--n-samples", type=int, default=None,
                        help="Process only first N files (default: all)")
+    parser.add_argument("--dedup-pages", action="store_true",
+                       help="Reuse output for visually identical PDF pages (Gemini, Qwen)")
 
     args = parser.parse_args()
 
@@ -340,7 +356,8 @@ def main():
     image_count = len(document_files) - pdf_count
     log(f"Found {len(document_files)} file(s): {pdf_count} PDF(s), {image_count} image(s)")
 
-    run_selected_models_timed_with_datetime(document_files, selected_models, args.output_dir, args.optimize)
+    run_selected_models_timed_with_datetime(document_files, selected_models, args.output_dir, args.optimize,
+                                            args.dedup_pages)
 
 
 if __name__ == "__main__":
@@ -3,10 +3,11 @@
 
 Modules:
     timing - Execution time measurement utilities
-    file_utils - File I/O helpers (save_html, save_markdown)
-    html_utils - HTML normalization utilities
+    file_utils - File I/O helpers (save_html, save_markdown, markdown_page_writer, scan_files)
+    html_utils - HTML normalization and text extraction utilities
     etl_extractor - ETL dataset extraction utilities
     logging - Logging utilities with consistent timestamp format
+    ocr_cache - Disk-backed OCR result cache keyed by input content
 """
 
 from .logging import (
@@ -15,7 +16,7 @@
     log_model_error, log_file_complete
 )
 from .timing import measure_time, save_timing_results, print_timing_summary
-from .file_utils import save_html, save_markdown
+from .file_utils import PAGE_SEPARATOR, markdown_page_writer, save_html, save_markdown, scan_files
 
 __all__ = [
     # Logging
@@ -36,4 +37,7 @@
     # File utils
     "save_html",
     "save_markdown",
+    "markdown_page_writer",
+    "scan_files",
+    "PAGE_SEPARATOR",
 ]
\ No newline at end of file
@@ -1,8 +1,14 @@
 """File I/O utilities for saving and loading documents."""
 
+import io
+import os
+from contextlib import contextmanager
 from pathlib import Path
 from src.utils.html_utils import normalize_html_content
 
+# Separator placed between pages in multi-page Markdown output
+PAGE_SEPARATOR = "\n\n---\n\n"
+
 
 def save_html(html, pdf_path, output_dir):
     """
@@ -30,4 +36,97 @@ def save_markdown(markdown, pdf_path, output_dir):
     """
     output_path = output_dir / pdf_path.with_suffix(".md").name
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(markdown)
\ No newline at end of file
+        f.write(markdown)
+
+
+class _MarkdownPageWriter:
+    """Page-by-page Markdown writer yielded by ``markdown_page_writer``."""
+
+    def __init__(self, f, output_path=None):
+        self._f = f
+        self._output_path = output_path
+        self._first = True
+
+    def __call__(self, text):
+        """Append one page (with separator)."""
+        if not self._first:
+            self._f.write(PAGE_SEPARATOR)
+        self._f.write(text)
+        self._first = False
+
+    def getvalue(self):
+        """
+        Return the whole Markdown document.
+
+        Call after the ``with`` block; a saved document is read back from its
+        file, so callers never have to keep every page in memory.
+        """
+        if self._output_path is None:
+            return self._f.getvalue()
+        return self._output_path.read_text(encoding="utf-8")
+
+
+@contextmanager
+def markdown_page_writer(pdf_path, output_dir):
+    """
+    Open a Markdown output file for incremental, page-by-page writing.
+
+    Pages are written as soon as they are produced (callers must pass them in
+    page order), so the file never has to be assembled from one large joined
+    string. They go to a temporary file next to the output, which replaces
+    ``<stem>.md`` only when the ``with`` block completes; if it raises, the
+    partial file is removed, so a failed document never leaves a truncated
+    result behind. Without an output directory the pages are collected in
+    memory instead.
+
+    Args:
+        pdf_path: Original PDF path (for naming)
+        output_dir: Directory to save the Markdown file, or None to keep pages in memory only
+
+    Yields:
+        callable: ``write_page(text)`` appending one page (with separator);
+            ``write_page.getvalue()`` returns the whole document
+    """
+    if output_dir is None:
+        yield _MarkdownPageWriter(io.StringIO())
+        return
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / pdf_path.with_suffix(".md").name
+    tmp_path = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            yield _MarkdownPageWriter(f, output_path)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def scan_files(root, suffix):
+    """
+    Recursively find files whose name ends with ``suffix`` (like ``rglob``).
+
+    Walks with ``os.scandir``, whose entries carry the file type from the
+    directory listing, so no extra ``stat`` call is made per file and only
+    matching entries become ``Path`` objects.
+
+    Args:
+        root: Directory to search
+        suffix: File name suffix, or a tuple of suffixes matched in a single walk
+
+    Returns:
+        list[Path]: Matching paths, sorted like ``sorted(root.rglob(f"*{suffix}"))``
+    """
+    paths = []
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(suffix):
+                    paths.append(entry.path)
+    # Compare by path components, as Path ordering does
+    paths.sort(key=lambda path: path.split(os.sep))
+    return [Path(path) for path in paths]
@@ -2,6 +2,7 @@
 
 from bs4 import BeautifulSoup
 import chardet
+from selectolax.lexbor import LexborHTMLParser
 
 
 def normalize_html_content(content):
@@ -62,4 +63,27 @@ def normalize_html_content(content):
     """
     soup.head.append(style)
 
-    return str(soup)
\ No newline at end of file
+    return str(soup)
+
+
+def extract_html_text(html_content):
+    """
+    Extract the text of HTML content, without script/style contents.
+
+    Uses selectolax (lexbor), which extracts text without building a Python
+    object tree. Whitespace is returned as is; callers normalize it.
+
+    Args:
+        html_content: HTML content string
+
+    Returns:
+        str: Text content (empty for blank input)
+    """
+    if not html_content or not html_content.strip():
+        return ""
+
+    tree = LexborHTMLParser(html_content)
+    for node in tree.css("script, style"):
+        node.decompose()
+    # No separator, matching BeautifulSoup's get_text()
+    return tree.text()
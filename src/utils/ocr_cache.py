@@ -0,0 +1,117 @@
+"""Disk-backed cache of OCR results, keyed by input content."""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import orjson
+
+from src.config import get_settings
+
+
+def _file_digest(path):
+    """
+    Start a hash of the file bytes, using BLAKE3 when ``blake3`` is installed.
+
+    BLAKE3 is SIMD-accelerated and hashes a memory-mapped file on several
+    threads, so cache lookups on large PDFs stay cheap. Stdlib BLAKE2b (also
+    faster than SHA-256) is the fallback.
+
+    Returns:
+        Hash object, ready for further ``update`` calls
+    """
+    try:
+        from blake3 import blake3
+    except ImportError:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=32))
+    digest = blake3(max_threads=blake3.AUTO)
+    digest.update_mmap(path)
+    return digest
+
+
+def cache_key(path, model, prompt=""):
+    """
+    Build the cache key for one input.
+
+    The key hashes the file bytes (see ``_file_digest``) plus the model
+    identifier and prompt, so changing either of them invalidates earlier
+    results.
+
+    Args:
+        path: Path to the input file
+        model: Model identifier (include any settings that change the output)
+        prompt: Prompt text, if any
+
+    Returns:
+        str: Hex digest
+    """
+    digest = _file_digest(path)
+    for part in (model, prompt):
+        digest.update(b"\0")
+        digest.update(part.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cache_path(key):
+    return Path(get_settings().cache.dir).expanduser() / f"{key}.json"
+
+
+def load(key):
+    """
+    Look up a cached result.
+
+    Returns:
+        Cached value, or None on a miss (or when the cache is disabled)
+    """
+    if not get_settings().cache.enabled:
+        return None
+    try:
+        return orjson.loads(_cache_path(key).read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return None
+
+
+def store(key, value):
+    """
+    Store a JSON-serializable result (no-op when the cache is disabled).
+
+    The entry is written to a temporary file and renamed into place, so
+    concurrent readers never see a partially written result.
+    """
+    if not get_settings().cache.enabled:
+        return
+    path = _cache_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(value))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def cached(path, model, prompt, compute):
+    """
+    Return the cached result for an input, computing and storing it on a miss.
+
+    Args:
+        path: Path to the input file
+        model: Model identifier (see ``cache_key``)
+        prompt: Prompt text, if any
+        compute: Zero-argument callable producing the result
+
+    Returns:
+        Cached or freshly computed result
+    """
+    if not get_settings().cache.enabled:
+        return compute()
+    key = cache_key(path, model, prompt)
+    result = load(key)
+    if result is None:
+        result = compute()
+        store(key, result)
+    return result
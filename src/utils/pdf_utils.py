@@ -0,0 +1,346 @@
+"""PDF rasterization utilities."""
+
+import io
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+import fitz  # PyMuPDF
+import numpy as np
+import pypdfium2 as pdfium
+from PIL import Image
+
+from src.config import get_settings
+
+
+def _page_scale(page, dpi, max_long_side):
+    """
+    Pick the render scale for a page, capping its longest side in pixels.
+
+    Vision APIs downscale images beyond their size cutoff anyway, so pixels above
+    ``max_long_side`` are paid for (encode, upload) and then discarded.
+    """
+    scale = dpi / 72  # page sizes are in points (1/72 inch)
+    if max_long_side:
+        long_side_pt = max(page.get_size())
+        if long_side_pt > 0:
+            scale = min(scale, max_long_side / long_side_pt)
+    return scale
+
+
+@lru_cache(maxsize=1)
+def _get_turbojpeg():
+    """Load libjpeg-turbo through PyTurboJPEG, or None if unavailable."""
+    try:
+        from turbojpeg import TurboJPEG
+        return TurboJPEG()
+    except (ImportError, RuntimeError, OSError):
+        # Package missing, or the libjpeg-turbo shared library was not found
+        return None
+
+
+def _encode_jpeg(image, quality):
+    """
+    Encode a PIL image as JPEG bytes.
+
+    Uses libjpeg-turbo's SIMD encoder when PyTurboJPEG is installed and
+    RENDER_USE_TURBOJPEG is enabled, otherwise stock Pillow.
+    """
+    turbo = _get_turbojpeg() if get_settings().render.use_turbojpeg else None
+    if turbo is not None and image.mode == "RGB":
+        from turbojpeg import TJPF_RGB
+        return turbo.encode(np.asarray(image), quality=quality, pixel_format=TJPF_RGB)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def render_pdf_to_jpeg(pdf_path, dpi, max_long_side=0, quality=85):
+    """
+    Render every page of a PDF to JPEG bytes with PDFium.
+
+    Rendering happens in-process (no ``pdftoppm`` subprocess or PPM round trip).
+    PDFium itself is not thread-safe, so pages are rasterized sequentially while
+    JPEG encoding, which releases the GIL, runs in a thread pool alongside it.
+
+    Args:
+        pdf_path: Path to PDF file
+        dpi: Rendering DPI (upper bound when ``max_long_side`` is set)
+        max_long_side: Maximum longest-side length in pixels (0 disables the cap)
+        quality: JPEG quality
+
+    Returns:
+        list[bytes]: JPEG-encoded page images, in page order
+    """
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
+            futures = []
+            for page in pdf:
+                image = page.render(scale=_page_scale(page, dpi, max_long_side)).to_pil()
+                page.close()
+                futures.append(executor.submit(_encode_jpeg, image, quality))
+            return [future.result() for future in futures]
+    finally:
+        pdf.close()
+
+
+def fitz_page_scale(page, dpi, max_long_side=0):
+    """
+    Pick the render scale for a PyMuPDF page, capping its longest side in pixels.
+
+    Args:
+        page: ``fitz.Page`` to render
+        dpi: Rendering DPI (upper bound when ``max_long_side`` is set)
+        max_long_side: Maximum longest-side length in pixels (0 disables the cap)
+
+    Returns:
+        float: Scale factor for ``fitz.Matrix``
+    """
+    scale = dpi / 72
+    if max_long_side:
+        long_side_pt = max(page.rect.width, page.rect.height)
+        if long_side_pt > 0:
+            scale = min(scale, max_long_side / long_side_pt)
+    return scale
+
+
+def render_page_jpeg(page, dpi, max_long_side=0, quality=85):
+    """
+    Render one PyMuPDF page straight to JPEG bytes.
+
+    MuPDF encodes the JPEG itself, so there is no PIL image or ``BytesIO``
+    round trip; callers can render and submit one page at a time instead of
+    materializing the whole document first.
+
+    Args:
+        page: ``fitz.Page`` to render
+        dpi: Rendering DPI (upper bound when ``max_long_side`` is set)
+        max_long_side: Maximum longest-side length in pixels (0 disables the cap)
+        quality: JPEG quality
+
+    Returns:
+        bytes: JPEG-encoded page image
+    """
+    scale = fitz_page_scale(page, dpi, max_long_side)
+    pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+    return pix.tobytes("jpeg", jpg_quality=quality)
+
+
+def native_image_scale(page, coverage=0.9):
+    """
+    Find the scale at which a scanned page renders at its native resolution.
+
+    Scanned PDFs are typically one embedded image covering the whole page;
+    rendering them above the image's own resolution only interpolates pixels.
+
+    Args:
+        page: ``fitz.Page`` to inspect
+        coverage: Fraction of the page area a single image must cover
+
+    Returns:
+        float | None: Native scale, or None if the page is not a full-page image
+    """
+    page_area = page.rect.width * page.rect.height
+    for info in page.get_image_info():
+        bbox = fitz.Rect(info["bbox"])
+        if bbox.width > 0 and bbox.height > 0 and bbox.width * bbox.height >= coverage * page_area:
+            return max(info["width"] / bbox.width, info["height"] / bbox.height)
+    return None
+
+
+def render_page_rgb(page, dpi, max_long_side=0, grid=1, max_pixels=0, cap_to_native=False):
+    """
+    Render one PyMuPDF page to raw RGB samples.
+
+    With ``grid`` > 1 both sides are snapped to a multiple of ``grid`` pixels
+    (e.g. a vision model's patch size), rendering straight at that size
+    instead of resampling afterwards.
+
+    Args:
+        page: ``fitz.Page`` to render
+        dpi: Rendering DPI (upper bound when ``max_long_side`` is set)
+        max_long_side: Maximum longest-side length in pixels (0 disables the cap)
+        grid: Pixel multiple both sides are snapped to
+        max_pixels: Maximum rendered area in pixels (0 disables the cap)
+        cap_to_native: Never render a scanned page above its embedded image's resolution
+
+    Returns:
+        tuple: ``(width, height, samples)`` for ``Image.frombytes("RGB", ...)``
+    """
+    scale = fitz_page_scale(page, dpi, max_long_side)
+    width, height = page.rect.width, page.rect.height
+    if max_pixels and width > 0 and height > 0:
+        scale = min(scale, math.sqrt(max_pixels / (width * height)))
+    if cap_to_native:
+        native_scale = native_image_scale(page)
+        if native_scale:
+            scale = min(scale, native_scale)
+
+    if grid > 1:
+        target_width = max(grid, round(width * scale / grid) * grid)
+        target_height = max(grid, round(height * scale / grid) * grid)
+        matrix = fitz.Matrix(target_width / width, target_height / height)
+    else:
+        matrix = fitz.Matrix(scale, scale)
+    pix = page.get_pixmap(matrix=matrix, alpha=False)
+    return pix.width, pix.height, pix.samples
+
+
+# Document handle owned by each rendering worker process (a fitz.Document
+# cannot be shared across processes, so every worker opens its own), keyed by
+# path and modification time so an edited file is reopened
+_worker_doc_key = None
+_worker_doc = None
+
+
+def _open_worker_doc(doc_key):
+    """Open the PDF in a rendering worker, reusing it across pages of the same document."""
+    global _worker_doc_key, _worker_doc
+    if doc_key != _worker_doc_key:
+        if _worker_doc is not None:
+            _worker_doc.close()
+        _worker_doc = fitz.open(doc_key[0])
+        _worker_doc_key = doc_key
+    return _worker_doc
+
+
+def _render_worker_page(doc_key, page_num, render, args):
+    """Render one page of a document in a rendering worker process."""
+    return render(_open_worker_doc(doc_key)[page_num], *args)
+
+
+# Rendering pool shared by every document (created on first use)
+_render_pool = None
+_render_pool_workers = 0
+_render_pool_lock = threading.Lock()
+
+
+def _get_render_pool(workers):
+    """
+    Return the shared rendering process pool, (re)creating it for ``workers`` processes.
+
+    Workers are started with ``spawn``: callers (e.g. the Qwen pipeline) render
+    from a background thread of a process that may already have initialized
+    CUDA, where forking can deadlock. The pool is long-lived, so the spawn cost
+    is paid once per process rather than once per document. When the worker
+    count changes, the previous pool still finishes the pages already
+    submitted (other documents may be waiting on them) before its processes
+    exit.
+    """
+    global _render_pool, _render_pool_workers
+    with _render_pool_lock:
+        if _render_pool is None or _render_pool_workers != workers:
+            if _render_pool is not None:
+                _render_pool.shutdown(wait=False)
+            _render_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _render_pool_workers = workers
+        return _render_pool
+
+
+def _render_pages(pdf_path, n_pages, render, *args, page_nums=None):
+    """
+    Apply ``render(page, *args)`` to every page, in parallel across processes.
+
+    Pages are rendered in a shared pool of RENDER_WORKERS processes and
+    yielded in page order as they become available. With one worker, or a
+    single page, pages are rendered in-process. ``page_nums`` restricts
+    rendering to the given (0-based) pages. Closing the generator early
+    cancels the pages not yet rendered.
+    """
+    if page_nums is None:
+        page_nums = range(n_pages)
+    workers = get_settings().render.workers or min(8, os.cpu_count() or 1)
+
+    if workers <= 1 or len(page_nums) <= 1:
+        with fitz.open(pdf_path) as doc:
+            for page_num in page_nums:
+                yield render(doc[page_num], *args)
+        return
+
+    stat = os.stat(pdf_path)
+    doc_key = (str(pdf_path), stat.st_mtime_ns, stat.st_size)
+    pool = _get_render_pool(workers)
+    futures = [pool.submit(_render_worker_page, doc_key, page_num, render, args) for page_num in page_nums]
+    try:
+        for future in futures:
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def render_pages_jpeg(pdf_path, n_pages, dpi, max_long_side=0, quality=85):
+    """
+    Render every page of a PDF to JPEG bytes, in parallel across processes.
+
+    Pages are yielded in page order as they become available, so callers can
+    start consuming (e.g. sending API requests) before the whole document is
+    rendered.
+
+    Args:
+        pdf_path: Path to PDF file
+        n_pages: Number of pages in the document
+        dpi: Rendering DPI (upper bound when ``max_long_side`` is set)
+        max_long_side: Maximum longest-side length in pixels (0 disables the cap)
+        quality: JPEG quality
+
+    Yields:
+        bytes: JPEG-encoded page image, in page order
+    """
+    return _render_pages(pdf_path, n_pages, render_page_jpeg, dpi, max_long_side, quality)
+
+
+def render_pages_rgb(
+    pdf_path, n_pages, dpi, max_long_side=0, grid=1, max_pixels=0, cap_to_native=False, page_nums=None
+):
+    """
+    Render every page of a PDF to raw RGB samples, in parallel across processes.
+
+    Args:
+        pdf_path: Path to PDF file
+        n_pages: Number of pages in the document
+        dpi: Rendering DPI (upper bound when ``max_long_side`` is set)
+        max_long_side: Maximum longest-side length in pixels (0 disables the cap)
+        grid: Pixel multiple both sides are snapped to
+        max_pixels: Maximum rendered area in pixels (0 disables the cap)
+        cap_to_native: Never render a scanned page above its embedded image's resolution
+        page_nums: Only render these (0-based) pages (default: all)
+
+    Yields:
+        tuple: ``(width, height, samples)`` per page, in page order
+    """
+    return _render_pages(
+        pdf_path, n_pages, render_page_rgb, dpi, max_long_side, grid, max_pixels, cap_to_native,
+        page_nums=page_nums,
+    )
+
+
+def page_dhash(image, hash_size=16):
+    """
+    Compute a difference hash (dHash) of a rendered page.
+
+    Visually identical pages (blank pages, repeated covers or separators)
+    produce the same hash, so their model output can be reused. A 16x16 hash
+    (256 bits) is used rather than the usual 8x8 so that text pages with
+    similar layouts do not collide.
+
+    Args:
+        image: PIL image, or JPEG-encoded bytes
+        hash_size: Hash grid size (``hash_size ** 2`` bits)
+
+    Returns:
+        bytes: Packed hash, usable as a dict key
+    """
+    if isinstance(image, (bytes, bytearray)):
+        image = Image.open(io.BytesIO(image))
+        # Let the JPEG decoder downscale in the DCT domain instead of decoding full resolution
+        image.draft("L", (hash_size * 8, hash_size * 8))
+    pixels = np.asarray(image.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR), dtype=np.int16)
+    return np.packbits(pixels[:, 1:] > pixels[:, :-1]).tobytes()
@@ -0,0 +1,41 @@
+"""Tests for OCR text aggregation."""
+
+import json
+
+from src.postprocess.aggregate import process_yomitoku_outputs
+
+
+def _page(*contents):
+    """Minimal YOMITOKU page result with the given paragraphs, in order."""
+    return {
+        "paragraphs": [{"order": i, "contents": text} for i, text in enumerate(contents)],
+        "words": [],
+    }
+
+
+class TestProcessYomitokuOutputs:
+    """Test YOMITOKU output discovery and text extraction."""
+
+    def test_per_page_json(self, tmp_path):
+        """Test that the first page is read from {stem}_0.json files."""
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "sample_0.json").write_text(
+            json.dumps(_page("一行目", "二行目"), ensure_ascii=False), encoding="utf-8"
+        )
+        (tmp_path / "docs" / "sample_1.json").write_text(json.dumps(_page("二ページ目")), encoding="utf-8")
+
+        assert process_yomitoku_outputs(tmp_path) == {"sample": "一行目二行目"}
+
+    def test_json_lines(self, tmp_path):
+        """Test that the first line of {stem}.jsonl is read (YOMITOKU-OCR default output)."""
+        (tmp_path / "docs").mkdir()
+        lines = [json.dumps(_page("一行目", "二行目"), ensure_ascii=False), json.dumps(_page("二ページ目"))]
+        (tmp_path / "docs" / "sample.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        assert process_yomitoku_outputs(tmp_path) == {"sample": "一行目二行目"}
+
+    def test_json_lines_skipped_first_page(self, tmp_path):
+        """Test that a skipped first page ("null" line) yields empty text."""
+        (tmp_path / "sample.jsonl").write_text("null\n" + json.dumps(_page("二ページ目")) + "\n", encoding="utf-8")
+
+        assert process_yomitoku_outputs(tmp_path) == {"sample": ""}
@@ -1,7 +1,5 @@
 """Tests for configuration module."""
 
-import os
-
 import pytest
 
 from src.config import (
@@ -12,6 +10,8 @@
     ClaudeConfig,
     QwenConfig,
     YomitokuConfig,
+    RenderConfig,
+    CacheConfig,
     get_settings,
     clear_settings_cache,
 )
@@ -27,6 +27,7 @@ def test_upstage_defaults(self):
         assert config.endpoint == "https://api.upstage.ai/v1/document-digitization"
         assert config.layout_model == "document-parse-nightly"
         assert config.ocr_model == "ocr-nightly"
+        assert config.max_workers == 8
 
     def test_azure_defaults(self):
         """Test Azure default values."""
@@ -35,6 +36,9 @@ def test_azure_defaults(self):
         assert config.api_key is None
         assert config.layout_model == "prebuilt-layout"
         assert config.ocr_model == "prebuilt-read"
+        assert config.max_workers == 16
+        assert config.blob_container_url is None
+        assert config.blob_threshold_mb == 10
 
     def test_gemini_defaults(self):
         """Test Gemini default values."""
@@ -42,6 +46,11 @@ def test_gemini_defaults(self):
         assert config.api_key is None
         assert config.model == "gemini-2.5-flash"
         assert config.dpi == 200
+        assert config.max_long_side == 1600
+        assert config.jpeg_quality == 80
+        assert config.max_workers == 8
+        assert config.max_retries == 5
+        assert config.stream is True
 
     def test_claude_defaults(self):
         """Test Claude default values."""
@@ -50,6 +59,9 @@ def test_claude_defaults(self):
         assert config.model == "claude-sonnet-4-5-20250929"
         assert config.max_tokens == 4096
         assert config.dpi == 200
+        assert config.max_long_side == 2048
+        assert config.max_workers == 8
+        assert config.use_files_api is False
 
     def test_qwen_defaults(self):
         """Test Qwen default values."""
@@ -58,12 +70,37 @@ def test_qwen_defaults(self):
         assert config.max_new_tokens == 2048
         assert config.temperature == 0.1
         assert config.do_sample is False
+        assert config.dpi == 150
+        assert config.max_long_side == 1600
+        assert config.max_pixels == 0
+        assert config.cap_to_native_resolution is False
+        assert config.batch_size == 4
+        assert config.quantization == "none"
+        assert config.backend == "transformers"
+        assert config.compile is False
+        assert config.adaptive_max_new_tokens is False
+        assert config.stop_on_repetition is False
+        assert config.page_cache_size == 0
+        assert config.text_layer_min_chars == 0
 
     def test_yomitoku_defaults(self):
         """Test YOMITOKU default values."""
         config = YomitokuConfig()
         assert config.visualize is True
 
+    def test_render_defaults(self):
+        """Test rendering default values."""
+        config = RenderConfig()
+        assert config.use_turbojpeg is True
+        assert config.workers == 0
+        assert config.dedup_pages is False
+
+    def test_cache_defaults(self):
+        """Test OCR cache default values."""
+        config = CacheConfig()
+        assert config.enabled is False
+        assert config.dir == "~/.cache/ocr"
+
 
 class TestEnvironmentVariableOverrides:
     """Test environment variable overrides."""
@@ -105,6 +142,29 @@ def test_claude_max_tokens_override(self, monkeypatch):
         settings = get_settings()
         assert settings.claude.max_tokens == 8192
 
+    def test_gemini_concurrency_alias(self, monkeypatch):
+        """Test GEMINI_CONCURRENCY as an alias of GEMINI_MAX_WORKERS."""
+        monkeypatch.setenv("GEMINI_CONCURRENCY", "16")
+        settings = get_settings()
+        assert settings.gemini.max_workers == 16
+
+        monkeypatch.setenv("GEMINI_MAX_WORKERS", "4")
+        clear_settings_cache()
+        settings = get_settings()
+        assert settings.gemini.max_workers == 4
+
+    def test_claude_max_workers_override(self, monkeypatch):
+        """Test CLAUDE_MAX_WORKERS environment variable."""
+        monkeypatch.setenv("CLAUDE_MAX_WORKERS", "4")
+        settings = get_settings()
+        assert settings.claude.max_workers == 4
+
+    def test_claude_use_files_api_override(self, monkeypatch):
+        """Test CLAUDE_USE_FILES_API environment variable."""
+        monkeypatch.setenv("CLAUDE_USE_FILES_API", "true")
+        settings = get_settings()
+        assert settings.claude.use_files_api is True
+
     def test_qwen_temperature_override(self, monkeypatch):
         """Test QWEN_TEMPERATURE environment variable."""
         monkeypatch.setenv("QWEN_TEMPERATURE", "0.5")
@@ -145,6 +205,13 @@ def test_claude_max_tokens_range(self):
         with pytest.raises(ValueError):
             ClaudeConfig(max_tokens=0)
 
+    def test_qwen_quantization_choices(self):
+        """Test Qwen quantization validation."""
+        assert QwenConfig(quantization="int8").quantization == "int8"
+
+        with pytest.raises(ValueError):
+            QwenConfig(quantization="int4")
+
     def test_qwen_temperature_range(self):
         """Test Qwen temperature validation."""
         # Valid temperature
@@ -159,6 +226,12 @@ def test_qwen_temperature_range(self):
         with pytest.raises(ValueError):
             QwenConfig(temperature=2.5)
 
+    def test_nested_configs_are_frozen(self):
+        """Test that nested configs reject attribute assignment."""
+        config = ClaudeConfig()
+        with pytest.raises(ValueError):
+            config.max_tokens = 1000
+
 
 class TestSettingsSingleton:
     """Test settings singleton behavior."""
@@ -216,3 +289,5 @@ def test_nested_config_objects(self):
         assert isinstance(settings.claude, ClaudeConfig)
         assert isinstance(settings.qwen, QwenConfig)
         assert isinstance(settings.yomitoku, YomitokuConfig)
+        assert isinstance(settings.render, RenderConfig)
+        assert isinstance(settings.cache, CacheConfig)
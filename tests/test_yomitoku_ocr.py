@@ -0,0 +1,19 @@
+"""Tests for YOMITOKU-OCR post-processing."""
+
+import json
+
+from src.postprocess.yomitoku_ocr import process_yomitoku_outputs
+
+
+class TestProcessYomitokuOutputs:
+    """Test YOMITOKU-OCR output discovery and evaluation."""
+
+    def test_json_lines_skipped_first_page(self, tmp_path):
+        """Test that a skipped first page ("null" line) is evaluated as empty text."""
+        page = {"words": [{"content": "二ページ目", "points": [[0, 0], [10, 0], [10, 10], [0, 10]],
+                           "det_score": 1.0, "rec_score": 1.0}]}
+        (tmp_path / "sample.jsonl").write_text("null\n" + json.dumps(page) + "\n", encoding="utf-8")
+
+        results = process_yomitoku_outputs(tmp_path, {"sample": "正解"})
+
+        assert [(r["filename"], r["predicted"], r["word_count"]) for r in results] == [("sample", "", 0)]